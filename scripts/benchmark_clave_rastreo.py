@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la extracción de ClaveRastreo
+
+Compara la extracción anterior (hasta tres ``re.search`` por fila con
+``Series.map``) contra ``extract_clave_rastreo`` (patrones precompilados
+aplicados a la columna completa; RE2 de pyarrow si está instalado) y
+verifica que ambas den lo mismo.
+
+Uso:
+    python scripts/benchmark_clave_rastreo.py [filas]
+"""
+
+import re
+import sys
+import time
+import random
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.parser import extract_clave_rastreo, pc  # noqa: E402
+
+DEFAULT_ROWS = 500_000
+
+DESCRIPCIONES = [
+    "SPEI RECIBIDO clave de rastreo: MBAN01002507210{n:06d}",
+    "SPEI ENVIADO CLAVE DE RASTREO 2025072140014TRANSFER{n:05d}",
+    "SPEI RECIBIDO BANORTE REF {n} CONCEPTO PAGO FACTURA",
+    "COMISION POR TRANSFERENCIA SPEI",
+    "IVA COMISION",
+    "DEPOSITO EN EFECTIVO SUC 0{n:04d}",
+    "PAGO TARJETA POS 4{n:011d}",
+    "RETIRO CAJERO AUTOMATICO",
+]
+
+
+def extract_cr_legacy(desc):
+    """Implementación anterior (por fila)"""
+    if not isinstance(desc, str):
+        return None
+    m = re.search(r"clave de rastreo:\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
+    if m:
+        return m.group(1)
+    m = re.search(r"clave de rastreo\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
+    if m:
+        return m.group(1)
+    m = re.search(r"\b([A-Za-z0-9]{12,})\b", desc)
+    if m:
+        return m.group(1)
+    return None
+
+
+def make_descriptions(rows: int, seed: int = 7) -> pd.Series:
+    """Columna Descripción sintética con la mezcla típica de un estado de cuenta"""
+    rng = random.Random(seed)
+    values = [rng.choice(DESCRIPCIONES).format(n=rng.randrange(10**5)) for _ in range(rows)]
+    return pd.Series(values, dtype=object, name="Descripción")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    descriptions = make_descriptions(rows)
+    print(f"Filas: {rows:,}")
+
+    legacy, legacy_s = timed(lambda s: s.map(extract_cr_legacy), descriptions)
+    print(f"Series.map + re.search: {legacy_s:.3f} s")
+
+    vectorized, vectorized_s = timed(extract_clave_rastreo, descriptions)
+    engine = "RE2/pyarrow" if pc is not None else "re"
+    print(f"extract_clave_rastreo ({engine}): {vectorized_s:.3f} s")
+
+    if not legacy.equals(vectorized.rename(legacy.name)):
+        print("❌ Los resultados no coinciden")
+        sys.exit(1)
+    print(f"✅ Resultados idénticos · {legacy_s / vectorized_s:.1f}x más rápido")
+
+
+if __name__ == "__main__":
+    main()
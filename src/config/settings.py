@@ -45,8 +45,23 @@ class Config:
             "DEMO_MODE": os.getenv("DEMO_MODE", "false").lower() == "true",
             "MAX_FILE_SIZE": int(os.getenv("MAX_FILE_SIZE", "200")),  # MB
             
+            # Configuración de lectura
+            "READ_CHUNK_SIZE": int(os.getenv("READ_CHUNK_SIZE", "50000")),  # filas por bloque
+            "READER_BACKEND": os.getenv("READER_BACKEND", "pandas").lower(),  # pandas | pyarrow
+            "READ_WORKERS": int(os.getenv("READ_WORKERS", "4")),  # archivos procesados en paralelo
+            "TAIL_FOLLOW": os.getenv("TAIL_FOLLOW", "false").lower() == "true",  # leer solo filas agregadas
+            "TAIL_STATE_DIR": os.getenv(
+                "TAIL_STATE_DIR", os.path.join(os.path.expanduser("~"), ".local", "state", "conciliador", "tail_state")
+            ),  # estado por cuenta, fuera del árbol de la app
+            "TIPO_RULES_PATH": os.getenv("TIPO_RULES_PATH", ""),  # tabla de tipos de movimiento (JSON)
+            
             # Configuración de rendimiento
             "CACHE_TTL": int(os.getenv("CACHE_TTL", "300")),  # segundos
+            "PARSE_CACHE_ENABLED": os.getenv("PARSE_CACHE_ENABLED", "false").lower() == "true",  # cache de parseo en disco
+            "CACHE_DIR": os.getenv(
+                "CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "conciliador", "parse_cache")
+            ),  # archivos ya parseados (Parquet), fuera del árbol de la app
+            "CACHE_MAX_MB": int(os.getenv("CACHE_MAX_MB", "500")),  # tamaño máximo del cache de parseo
             "RATE_LIMIT": int(os.getenv("RATE_LIMIT", "100")),  # requests por minuto
         }
     
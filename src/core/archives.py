@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Lectura de estados de cuenta comprimidos (.zip y .gz) sin archivos temporales
+
+Cada miembro se descomprime una sola vez, al primer acceso, a un buffer en
+memoria (``SpooledTemporaryFile``: pasa a un temporal en disco arriba de
+``SPOOL_MAX_MEMORY``). El tamaño descomprimido se limita al copiar.
+"""
+
+import io
+import gzip
+import logging
+import os
+import tempfile
+import zipfile
+from typing import IO, Callable, List, Optional, cast
+
+from utils.helpers import is_supported_file_type, validate_file_size
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = b"PK\x03\x04"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Descomprimido que se mantiene en memoria; arriba de esto el buffer pasa a disco
+SPOOL_MAX_MEMORY = 64 * 1024 * 1024
+_COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def _magic(uploaded_file) -> bytes:
+    """Primeros bytes del archivo; el buffer queda al inicio"""
+    uploaded_file.seek(0)
+    head = uploaded_file.read(4)
+    uploaded_file.seek(0)
+    return head or b""
+
+
+def is_archive(uploaded_file) -> bool:
+    """
+    Detectar si el archivo es .zip o .gz por sus bytes iniciales (no por extensión)
+    """
+    head = _magic(uploaded_file)
+    return head.startswith(ZIP_MAGIC) or head.startswith(GZIP_MAGIC)
+
+
+def _decompress(stream: IO[bytes], max_bytes: int, name: str) -> IO[bytes]:
+    """
+    Descomprimir un miembro una sola vez, con tope de tamaño
+
+    El tamaño descomprimido de un .gz no viene en el encabezado (un .gz
+    pequeño puede expandirse a gigabytes), así que se cuenta al copiar y se
+    aborta con ValueError al pasar de ``max_bytes``.
+
+    Returns:
+        Buffer con el contenido descomprimido, al inicio
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    total = 0
+    try:
+        with stream:
+            while True:
+                block = stream.read(min(_COPY_BLOCK_SIZE, max_bytes + 1 - total))
+                if not block:
+                    break
+                total += len(block)
+                if total > max_bytes:
+                    raise ValueError(f"{name} excede {max_bytes // (1024 * 1024)} MB descomprimido")
+                spool.write(block)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return cast(IO[bytes], spool)
+
+
+class ArchiveMember(io.BufferedIOBase):
+    """
+    Miembro de un archivo comprimido con interfaz de archivo binario
+
+    Al primer acceso se descomprime completo (una sola vez) a un buffer con
+    tope de tamaño; la detección de formato, la metadata, las secciones y
+    el lector por bloques retroceden sobre ese buffer sin volver a
+    descomprimir, igual que con un uploaded_file de Streamlit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        opener: Callable[[], IO[bytes]],
+        size: Optional[int] = None,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        super().__init__()
+        self.name = name
+        self.size = size
+        self._opener = opener
+        self._max_bytes = max_bytes
+        self._stream: Optional[IO[bytes]] = None
+
+    @property
+    def stream(self) -> IO[bytes]:
+        if self._stream is None:
+            self._stream = _decompress(self._opener(), self._max_bytes, self.name)
+        return self._stream
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self.stream.read(-1 if size is None else size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        return self.stream.readline(-1 if size is None else size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+def _gzip_opener(uploaded_file) -> Callable[[], IO[bytes]]:
+    return lambda: cast(IO[bytes], gzip.GzipFile(fileobj=uploaded_file, mode="rb"))
+
+
+def _member_opener(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> Callable[[], IO[bytes]]:
+    return lambda: archive.open(info)
+
+
+def open_archive_members(uploaded_file, max_member_size_mb: int = 200) -> List[ArchiveMember]:
+    """
+    Listar los estados de cuenta contenidos en un .zip o .gz
+
+    Args:
+        uploaded_file: Archivo comprimido subido desde Streamlit
+        max_member_size_mb: Tamaño máximo descomprimido por miembro (MB)
+
+    Returns:
+        Lista de ArchiveMember (TXT/CSV); cada uno se descomprime al primer acceso
+    """
+    archive_name = getattr(uploaded_file, "name", "archivo")
+    max_bytes = max_member_size_mb * 1024 * 1024
+    head = _magic(uploaded_file)
+
+    if head.startswith(GZIP_MAGIC):
+        name = archive_name[:-3] if archive_name.lower().endswith(".gz") else archive_name
+        return [ArchiveMember(name, _gzip_opener(uploaded_file), max_bytes=max_bytes)]
+
+    if not head.startswith(ZIP_MAGIC):
+        raise ValueError(f"{archive_name} no es un archivo .zip ni .gz")
+
+    archive = zipfile.ZipFile(uploaded_file)
+    members = []
+    for info in archive.infolist():
+        base_name = os.path.basename(info.filename)
+        if info.is_dir() or info.filename.startswith("__MACOSX/") or base_name.startswith("."):
+            continue
+        if not is_supported_file_type(base_name):
+            logger.info(f"Omitiendo {info.filename} de {archive_name}: tipo no soportado")
+            continue
+        if not validate_file_size(info.file_size, max_member_size_mb):
+            logger.warning(f"Omitiendo {info.filename} de {archive_name}: excede {max_member_size_mb} MB")
+            continue
+
+        members.append(
+            ArchiveMember(
+                f"{archive_name}/{info.filename}",
+                _member_opener(archive, info),
+                size=info.file_size,
+                max_bytes=max_bytes,
+            )
+        )
+
+    logger.info(f"{archive_name}: {len(members)} estado(s) de cuenta encontrados")
+    return members
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Backend de lectura con pyarrow para archivos de bancos registrados (BanBajío, BBVA...)
+
+pyarrow es opcional: si no está instalado ``PYARROW_AVAILABLE`` es False y
+el lector principal usa pandas.
+"""
+
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow es opcional
+    pa = pc = pacsv = None
+
+logger = logging.getLogger(__name__)
+
+PYARROW_AVAILABLE = pacsv is not None
+
+# Tamaño de bloque (bytes) del lector incremental de pyarrow
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def arrow_column_types(schema) -> dict:
+    """
+    Traducir un ReadSchema a tipos declarados de pyarrow
+
+    Texto y categorías se leen como ``string`` (sin inferencia); los montos
+    también se leen como texto para limpiar ``$`` y separadores de miles
+    antes de convertirlos a ``decimal128(18, 2)``.
+    """
+    if schema is None:
+        return {}
+    types = {col: pa.string() for col in schema.dtypes}
+    types.update({col: pa.string() for col in schema.amount_columns})
+    return types
+
+
+def _invalid_row_handler(invalid_rows: List[Tuple[str, str]]):
+    """
+    Handler de pyarrow que salta las filas mal formadas y las registra
+
+    Agrega a ``invalid_rows`` tuplas (texto de la fila, motivo); pyarrow no
+    reporta el número de línea, el lector lo ubica por el texto.
+    """
+    def handler(row):
+        invalid_rows.append((row.text, f"expected {row.expected_columns} fields, saw {row.actual_columns}"))
+        return "skip"
+    return handler
+
+
+def _options(encoding: str, delimiter: str, schema, block_size: Optional[int] = None, invalid_rows: Optional[list] = None):
+    read_options = pacsv.ReadOptions(
+        use_threads=True,
+        encoding="utf8" if encoding.lower().replace("-", "") in ("utf8", "utf8sig") else encoding,
+        **({"block_size": block_size} if block_size else {}),
+    )
+    parse_options = pacsv.ParseOptions(
+        delimiter=delimiter,
+        **({"invalid_row_handler": _invalid_row_handler(invalid_rows)} if invalid_rows is not None else {}),
+    )
+    convert_options = pacsv.ConvertOptions(
+        column_types=arrow_column_types(schema),
+        strings_can_be_null=True,
+    )
+    return read_options, parse_options, convert_options
+
+
+def _amount_to_cents(column):
+    """
+    Convertir una columna de montos (texto) a centavos int64 dentro de Arrow
+
+    Devuelve None si algún valor no es un decimal válido; en ese caso la
+    columna se deja como texto y el esquema la convierte con pandas.
+    """
+    clean = pc.replace_substring_regex(column, r"[\$,\s]", "")
+    clean = pc.if_else(pc.equal(clean, ""), pa.scalar(None, pa.string()), clean)
+    try:
+        amounts = pc.cast(clean, pa.decimal128(18, 2))
+    except pa.ArrowInvalid:
+        return None
+    cents = pc.cast(pc.multiply(amounts, 100), pa.int64())
+    return pc.fill_null(cents, 0)
+
+
+def _to_pandas(table, schema, start_row: int = 0) -> pd.DataFrame:
+    """
+    Aplicar el esquema en Arrow y convertir la tabla a DataFrame
+
+    Los montos se convierten a centavos y las categorías se codifican como
+    diccionario en Arrow (vectorizado); el resto del esquema se aplica en
+    pandas. El índice empieza en ``start_row`` para que los bloques sean
+    continuos.
+    """
+    if schema is not None:
+        for name in table.column_names:
+            idx = table.column_names.index(name)
+            if name in schema.amount_columns:
+                cents = _amount_to_cents(table[name])
+                if cents is not None:
+                    table = table.set_column(idx, name, cents)
+            elif name in schema.category_columns:
+                table = table.set_column(idx, name, pc.dictionary_encode(table[name]))
+
+    df = table.to_pandas()
+    df.index = pd.RangeIndex(start_row, start_row + len(df))
+    # Limpiar datos vacíos al final
+    df = df.dropna(how="all")
+    return schema.apply(df) if schema is not None else df
+
+
+def read_banbajio_arrow(
+    buffer,
+    header_offset: int,
+    encoding: str = "utf-8",
+    delimiter: str = ",",
+    schema=None,
+    invalid_rows: Optional[list] = None,
+) -> pd.DataFrame:
+    """
+    Leer un archivo BanBajío completo con el lector multihilo de pyarrow
+
+    Args:
+        buffer: Buffer binario (se lee desde ``header_offset``)
+        header_offset: Byte donde inicia la línea de encabezados
+        encoding: Codificación del archivo
+        delimiter: Delimitador de columnas
+        schema: ReadSchema con los tipos finales (opcional)
+        invalid_rows: Lista donde se registran las filas mal formadas
+            (texto, motivo); sin ella una fila mal formada aborta la lectura
+
+    Returns:
+        DataFrame con los datos leídos
+    """
+    buffer.seek(header_offset)
+    read_options, parse_options, convert_options = _options(
+        encoding, delimiter, schema, invalid_rows=invalid_rows
+    )
+    table = pacsv.read_csv(
+        buffer,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    return _to_pandas(table, schema)
+
+
+def iter_banbajio_arrow_batches(
+    buffer,
+    header_offset: int,
+    encoding: str = "utf-8",
+    delimiter: str = ",",
+    schema=None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    invalid_rows: Optional[list] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Leer un archivo BanBajío por bloques con el lector incremental de pyarrow
+
+    Args:
+        buffer: Buffer binario (se lee desde ``header_offset``)
+        header_offset: Byte donde inicia la línea de encabezados
+        encoding: Codificación del archivo
+        delimiter: Delimitador de columnas
+        schema: ReadSchema con los tipos finales (opcional)
+        block_size: Bytes por bloque
+        invalid_rows: Lista donde se registran las filas mal formadas
+            (texto, motivo); sin ella una fila mal formada aborta la lectura
+
+    Yields:
+        DataFrames con los datos de cada bloque
+    """
+    buffer.seek(header_offset)
+    read_options, parse_options, convert_options = _options(
+        encoding, delimiter, schema, block_size, invalid_rows
+    )
+    reader = pacsv.open_csv(
+        buffer,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    start_row = 0
+    for batch in reader:
+        df = _to_pandas(pa.Table.from_batches([batch]), schema, start_row)
+        start_row += batch.num_rows
+        if not df.empty:
+            yield df
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Continuidad del saldo corrido
+
+En un estado de cuenta cada saldo sale del anterior:
+``Saldo[i] == Saldo[i-1] + Abono[i] - Cargo[i]``. Una fila faltante o
+duplicada rompe esa igualdad justo donde ocurrió, así que revisarla es la
+forma más rápida de encontrarla.
+
+La revisión es vectorizada sobre centavos int64 (``np.diff``) y acepta
+estados en orden ascendente (antiguo → reciente) o descendente: se usa el
+orden con más filas consistentes. Si la tabla trae la columna ``Cuenta``
+(estados de cuenta concatenados) solo se comparan filas de la misma cuenta.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ASCENDING = "ascendente"
+DESCENDING = "descendente"
+NO_BALANCE = "sin saldo"
+
+
+@dataclass(frozen=True)
+class BalanceGap:
+    """Fila cuyo saldo no se sigue del movimiento anterior"""
+
+    position: int               # Posición (0-based) en la tabla parseada
+    row: Any                    # Etiqueta del índice de la fila
+    expected_cents: int         # Saldo anterior + Abono - Cargo
+    actual_cents: int           # Saldo que trae la fila
+
+    @property
+    def difference_cents(self) -> int:
+        return self.actual_cents - self.expected_cents
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "difference_cents": self.difference_cents}
+
+
+@dataclass
+class BalanceCheck:
+    """Resultado de la revisión de continuidad"""
+
+    order: str                  # ascendente, descendente o "sin saldo"
+    checked: int                # Pares de filas consecutivas revisados
+    gaps: List[BalanceGap] = field(default_factory=list)
+    gap_count: int = 0          # Saltos encontrados (``gaps`` puede estar recortada)
+
+    @property
+    def ok(self) -> bool:
+        return self.gap_count == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "order": self.order,
+            "checked": self.checked,
+            "gap_count": self.gap_count,
+            "gaps": [gap.to_dict() for gap in self.gaps],
+        }
+
+
+def _cents(df: pd.DataFrame, col: str):
+    """Columna en centavos int64 y máscara de valores válidos"""
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64), np.zeros(len(df), dtype=bool)
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+    valid = np.isfinite(values)
+    if pd.api.types.is_integer_dtype(df[col]) and df.attrs.get("amount_unit") == "cents":
+        cents = np.where(valid, values, 0).astype(np.int64)
+    else:
+        cents = np.rint(np.where(valid, values, 0) * 100).astype(np.int64)
+    return cents, valid
+
+
+def check_balance_continuity(df: pd.DataFrame, max_gaps: Optional[int] = None) -> BalanceCheck:
+    """
+    Revisar que cada Saldo sea el anterior más Abono menos Cargo
+
+    Las filas con montos inválidos (``MontoInvalido``) o vacíos no se
+    revisan ni sirven de saldo anterior, y el cambio de una cuenta a otra
+    (columna ``Cuenta``) no es un salto. Si la tabla no trae saldos (todos
+    vacíos o en cero) no se revisa.
+
+    Args:
+        df: Tabla parseada (Cargo, Abono y Saldo en pesos, en el orden del archivo)
+        max_gaps: Máximo de saltos a reportar (None: todos)
+
+    Returns:
+        BalanceCheck con el orden detectado y las filas con salto
+    """
+    saldo, saldo_ok = _cents(df, "Saldo")
+    abono, abono_ok = _cents(df, "Abono")
+    cargo, cargo_ok = _cents(df, "Cargo")
+
+    if len(df) < 2 or not (saldo_ok & (saldo != 0)).any():
+        return BalanceCheck(order=NO_BALANCE, checked=0)
+
+    row_ok = saldo_ok & abono_ok & cargo_ok
+    if "MontoInvalido" in df.columns:
+        row_ok &= ~df["MontoInvalido"].fillna(False).to_numpy(dtype=bool)
+    movement = abono - cargo
+
+    # Par (i-1, i): en orden ascendente el saldo de i sale del de i-1 con el
+    # movimiento de i; en descendente el de i-1 sale del de i con el de i-1
+    step = np.diff(saldo)
+    pair_ok = row_ok[1:] & row_ok[:-1]
+    if "Cuenta" in df.columns:
+        # Cada cuenta lleva su propio saldo: no se compara a través del cambio
+        accounts, _ = pd.factorize(df["Cuenta"], use_na_sentinel=False)
+        pair_ok &= np.diff(accounts) == 0
+    ascending = (step == movement[1:]) & pair_ok
+    descending = (-step == movement[:-1]) & pair_ok
+
+    if descending.sum() > ascending.sum():
+        order, consistent = DESCENDING, descending
+        # La fila más reciente del par es la primera
+        positions = np.flatnonzero(pair_ok & ~consistent)
+        previous = positions + 1
+    else:
+        order, consistent = ASCENDING, ascending
+        positions = np.flatnonzero(pair_ok & ~consistent) + 1
+        previous = positions - 1
+
+    gap_count = len(positions)
+    if max_gaps is not None:
+        positions, previous = positions[:max_gaps], previous[:max_gaps]
+    expected = saldo[previous] + movement[positions]
+    labels = df.index[positions].tolist()
+    gaps = [
+        BalanceGap(position=int(pos), row=label, expected_cents=int(exp), actual_cents=int(act))
+        for pos, label, exp, act in zip(positions, labels, expected, saldo[positions])
+    ]
+    return BalanceCheck(order=order, checked=int(pair_ok.sum()), gaps=gaps, gap_count=gap_count)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Registro de formatos bancarios conocidos
+
+Cada formato declara la firma de su línea de encabezados (regex compilada),
+en qué línea aparece y el esquema de tipos con el que se lee. La detección
+solo compara la línea esperada de cada formato contra su firma, así que el
+costo depende del tamaño de la muestra y no del archivo. Los formatos
+registrados se leen con el parser C (o pyarrow) sin pasar por la detección
+genérica de dialecto.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern
+
+from .schemas import BANBAJIO_SCHEMA, BANORTE_SCHEMA, BBVA_SCHEMA, SANTANDER_SCHEMA, ReadSchema
+
+
+@dataclass(frozen=True)
+class BankFormat:
+    """Formato de estado de cuenta de un banco"""
+
+    bank: str                   # Identificador ("banbajio", "bbva", ...)
+    signature: Pattern          # Firma de la línea de encabezados
+    header_row: int             # Índice (0-based) de la línea de encabezados
+    schema: ReadSchema
+    delimiter: str = ','
+
+    def matches(self, line: str) -> bool:
+        return self.signature.match(line) is not None
+
+
+def header_signature(*columns: str, delimiter: str = ',') -> Pattern:
+    """
+    Compilar la firma de un encabezado a partir de sus primeras columnas
+
+    Admite comillas opcionales, espacios alrededor del delimitador y
+    mayúsculas/minúsculas indistintas.
+    """
+    separator = r'\s*' + re.escape(delimiter) + r'\s*'
+    fields = [r'"?' + re.escape(c) + r'"?' for c in columns]
+    return re.compile(r'\s*' + separator.join(fields), re.IGNORECASE)
+
+
+# Formatos en orden de prioridad: el primero cuya firma coincide gana
+_BANK_FORMATS: Dict[str, BankFormat] = {}
+
+
+def register_bank_format(bank_format: BankFormat) -> None:
+    """
+    Registrar (o reemplazar) un formato bancario
+
+    Args:
+        bank_format: Formato con firma, línea de encabezados y esquema
+    """
+    _BANK_FORMATS[bank_format.bank] = bank_format
+
+
+def get_bank_format(bank: str) -> Optional[BankFormat]:
+    """Formato registrado para el banco indicado (None si no existe)"""
+    return _BANK_FORMATS.get(bank)
+
+
+def bank_formats() -> List[BankFormat]:
+    """Formatos registrados en orden de prioridad"""
+    return list(_BANK_FORMATS.values())
+
+
+def max_header_row() -> int:
+    """Línea de encabezados más lejana entre los formatos registrados"""
+    return max((f.header_row for f in _BANK_FORMATS.values()), default=0)
+
+
+def match_bank_format(lines: List[str]) -> Optional[BankFormat]:
+    """
+    Buscar el formato cuya firma coincide con las primeras líneas del archivo
+
+    Args:
+        lines: Primeras líneas completas del archivo, ya decodificadas
+
+    Returns:
+        BankFormat que coincide o None (formato genérico)
+    """
+    for bank_format in _BANK_FORMATS.values():
+        if bank_format.header_row < len(lines) and bank_format.matches(lines[bank_format.header_row]):
+            return bank_format
+    return None
+
+
+# BanBajío: línea 1 = metadata, línea 2 = encabezados
+register_bank_format(BankFormat(
+    bank="banbajio",
+    signature=header_signature('#', 'Fecha Movimiento', 'Hora', 'Recibo', 'Descripción'),
+    header_row=1,
+    schema=BANBAJIO_SCHEMA,
+))
+
+register_bank_format(BankFormat(
+    bank="bbva",
+    signature=header_signature('Fecha de Operación', 'Fecha Valor', 'Concepto', 'Referencia', 'Cargo', 'Abono', 'Saldo'),
+    header_row=0,
+    schema=BBVA_SCHEMA,
+))
+
+register_bank_format(BankFormat(
+    bank="santander",
+    signature=header_signature('Cuenta', 'Fecha', 'Hora', 'Sucursal', 'Descripción', 'Cargos', 'Abonos'),
+    header_row=0,
+    schema=SANTANDER_SCHEMA,
+))
+
+register_bank_format(BankFormat(
+    bank="banorte",
+    signature=header_signature('Cuenta', 'Fecha De Operación', 'Fecha', 'Referencia', 'Descripción'),
+    header_row=0,
+    schema=BANORTE_SCHEMA,
+))
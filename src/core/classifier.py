@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Clasificación del tipo de movimiento (columna Tipo) por reglas
+
+Las reglas viven en una tabla JSON (``config/tipos_movimiento.json`` o la
+indicada en ``TIPO_RULES_PATH``), en orden de prioridad: gana la primera
+regla cuya condición se cumpla sobre la descripción en minúsculas. Cada
+regla indica el tipo, las palabras que deben aparecer todas (``todas``) y
+las palabras de las que basta una (``alguna``). Agregar un tipo nuevo es
+agregar una fila a la tabla.
+
+Las reglas se compilan en una sola expresión regular ordenada (una
+alternativa con grupo nombrado por regla) y una columna se clasifica
+resolviendo solo sus descripciones distintas.
+"""
+
+import os
+import re
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Tabla de reglas incluida con la aplicación
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "tipos_movimiento.json"
+)
+
+# Descripciones distintas (en minúsculas) que se recuerdan ya clasificadas
+CLASSIFY_CACHE_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class TipoRule:
+    """Regla de clasificación: todas las palabras de ``todas`` y una de ``alguna``"""
+
+    tipo: str
+    todas: Tuple[str, ...] = ()
+    alguna: Tuple[str, ...] = ()
+
+    def pattern(self) -> str:
+        """Condición como lookaheads sobre el texto completo"""
+        conditions = [f"(?=[\\s\\S]*?{re.escape(word.lower())})" for word in self.todas]
+        if self.alguna:
+            words = "|".join(re.escape(word.lower()) for word in self.alguna)
+            conditions.append(f"(?=[\\s\\S]*?(?:{words}))")
+        return "".join(conditions)
+
+
+def load_tipo_rules(path: Optional[str] = None) -> List[TipoRule]:
+    """
+    Leer la tabla de reglas
+
+    Args:
+        path: Archivo JSON con una lista de reglas
+            (``{"tipo": ..., "todas": [...], "alguna": [...]}``)
+
+    Returns:
+        Reglas en orden de prioridad
+    """
+    with open(path or DEFAULT_RULES_PATH, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    rules = []
+    for entry in table:
+        rule = TipoRule(
+            tipo=entry["tipo"],
+            todas=tuple(entry.get("todas", ())),
+            alguna=tuple(entry.get("alguna", ())),
+        )
+        if not rule.todas and not rule.alguna:
+            raise ValueError(f"La regla '{rule.tipo}' no tiene palabras")
+        rules.append(rule)
+    return rules
+
+
+class TipoClassifier:
+    """Clasificador compilado a partir de una tabla de reglas"""
+
+    def __init__(self, rules: Sequence[TipoRule]):
+        self.rules = tuple(rules)
+        self._tipos = {f"r{i}": rule.tipo for i, rule in enumerate(self.rules)}
+        alternatives = "|".join(f"{rule.pattern()}(?P<r{i}>)" for i, rule in enumerate(self.rules))
+        self._pattern = re.compile(f"^(?:{alternatives})") if self.rules else None
+        self._classify_lowered = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._match)
+
+    def _match(self, lowered: str) -> str:
+        m = self._pattern.match(lowered) if self._pattern is not None else None
+        if m is None or m.lastgroup is None:
+            return ""
+        return self._tipos[m.lastgroup]
+
+    def classify(self, description) -> str:
+        """
+        Tipo de una descripción ("" si no es texto o ninguna regla aplica)
+        """
+        if not isinstance(description, str):
+            return ""
+        return self._classify_lowered(description.lower())
+
+    def classify_series(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Clasificar una columna completa
+
+        Solo se clasifican las descripciones distintas; el resultado se
+        reparte a las filas con los códigos de ``pd.factorize``.
+
+        Args:
+            descriptions: Columna de descripciones
+
+        Returns:
+            Serie Tipo con el mismo índice
+        """
+        codes, uniques = pd.factorize(descriptions)
+        # El código -1 (vacío) toma el último elemento
+        tipos = np.array([self.classify(value) for value in uniques] + [""], dtype=object)
+        return pd.Series(tipos[codes], index=descriptions.index, name="Tipo")
+
+
+@lru_cache(maxsize=None)
+def _classifier_for(path: str) -> TipoClassifier:
+    rules = load_tipo_rules(path)
+    logger.info(f"Reglas de tipo de movimiento cargadas: {len(rules)} ({path})")
+    return TipoClassifier(rules)
+
+
+def rules_path(path: Optional[str] = None) -> str:
+    """Tabla de reglas en uso: ``path``, ``TIPO_RULES_PATH`` o la incluida"""
+    if path:
+        return path
+    # Importar el parser no debe cargar (ni validar) la configuración
+    from config.settings import config
+
+    return config.get("TIPO_RULES_PATH") or DEFAULT_RULES_PATH
+
+
+def default_classifier(path: Optional[str] = None) -> TipoClassifier:
+    """
+    Clasificador de la tabla configurada (se compila una sola vez por archivo)
+
+    Args:
+        path: Tabla de reglas; por defecto ``TIPO_RULES_PATH`` o la incluida
+    """
+    return _classifier_for(rules_path(path))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Detección de codificación y decodificación incremental de estados de cuenta
+
+Las exportaciones de BanBajío pueden venir en UTF-8 o en cp1252/latin-1
+(Windows). La codificación se decide con el primer bloque del archivo y el
+resto se decodifica en streaming: nunca se reintenta la lectura del archivo
+completo con otra codificación.
+"""
+
+import io
+import codecs
+from typing import Tuple
+
+# Manejador de errores: bytes que no son UTF-8 válido se interpretan como
+# cp1252 (o latin-1 para los 5 bytes que cp1252 no define)
+ENCODING_ERRORS = "bank-cp1252"
+
+# Bytes decodificados por bloque al transcodificar a UTF-8
+TRANSCODE_BLOCK_SIZE = 1024 * 1024
+
+UTF8_ENCODINGS = ("utf-8", "utf-8-sig")
+
+
+def _byte_to_cp1252(value: int) -> str:
+    try:
+        return bytes([value]).decode("cp1252")
+    except UnicodeDecodeError:
+        return chr(value)
+
+
+_CP1252_CHARS = tuple(_byte_to_cp1252(value) for value in range(256))
+
+
+def _cp1252_fallback(error: UnicodeError) -> Tuple[str, int]:
+    """Decodificar como cp1252 los bytes inválidos y continuar"""
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    invalid = error.object[error.start:error.end]
+    return "".join(_CP1252_CHARS[value] for value in invalid), error.end
+
+
+codecs.register_error(ENCODING_ERRORS, _cp1252_fallback)
+
+
+def probe_encoding(sample: bytes) -> str:
+    """
+    Detectar la codificación a partir del primer bloque del archivo
+
+    El bloque se valida con un decodificador incremental, así que un
+    carácter multibyte cortado al final de la muestra no invalida UTF-8.
+
+    Args:
+        sample: Primeros bytes del archivo
+
+    Returns:
+        "utf-8-sig", "utf-8", "cp1252" o "latin-1"
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def is_utf8(encoding: str) -> bool:
+    """Indica si la codificación es UTF-8 (con o sin BOM)"""
+    return encoding.lower().replace("_", "-") in UTF8_ENCODINGS
+
+
+class Utf8Transcoder(io.RawIOBase):
+    """
+    Buffer binario que entrega en UTF-8 un origen en otra codificación
+
+    Lee el origen por bloques y los decodifica con
+    ``codecs.getincrementaldecoder``, de modo que los parsers (pandas C o
+    pyarrow) siempre reciben UTF-8 y la memoria queda acotada a un bloque.
+    Solo admite volver al inicio (``seek(0)``), que reinicia el decodificador.
+    """
+
+    def __init__(self, source, encoding: str, block_size: int = TRANSCODE_BLOCK_SIZE):
+        self._source = source
+        self._start = source.tell()
+        self.encoding = encoding
+        self._block_size = block_size
+        self._reset()
+
+    def _reset(self):
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors=ENCODING_ERRORS)
+        self._pending = b""
+        self._pending_pos = 0
+        self._pos = 0
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._pending_pos >= len(self._pending) and not self._eof:
+            block = self._source.read(self._block_size)
+            self._eof = not block
+            self._pending = self._decoder.decode(block, final=self._eof).encode("utf-8")
+            self._pending_pos = 0
+
+        n = min(len(b), len(self._pending) - self._pending_pos)
+        b[:n] = memoryview(self._pending)[self._pending_pos:self._pending_pos + n]
+        self._pending_pos += n
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._pos
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("Utf8Transcoder solo puede volver al inicio")
+        self._source.seek(self._start)
+        self._reset()
+        return 0
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def utf8_stream(buffer, encoding: str):
+    """
+    Preparar un buffer posicionado para leerse como UTF-8
+
+    Los archivos UTF-8 se entregan sin copia; cualquier otra codificación se
+    transcodifica en streaming.
+
+    Args:
+        buffer: Buffer binario ya posicionado donde inicia la lectura
+        encoding: Codificación detectada con ``probe_encoding``
+
+    Returns:
+        Tupla (buffer, codificación para el parser)
+    """
+    if is_utf8(encoding):
+        return buffer, encoding
+    return Utf8Transcoder(buffer, encoding), "utf-8"
@@ -6,6 +6,7 @@ Adaptador para convertir datos procesados al formato del tab Acumulado
 import pandas as pd
 from datetime import datetime
 import re
+from typing import Optional
 
 
 def convert_to_exact_date_format(date_str):
@@ -57,13 +58,17 @@ def format_currency_exact(amount):
         return ""
 
 
-def adapt_to_acumulado_format(df: pd.DataFrame, start_row: int = None) -> pd.DataFrame:
+def adapt_to_acumulado_format(df: pd.DataFrame, start_row: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
     """
     Convierte los datos procesados al formato EXACTO del tab Acumulado original
     
     Formato de referencia (filas 367, 368):
     367  6  3  12-jun-2025  16:10:22  3803705013215  [descripción]  $194,914.45
     368  6  1  12-jun-2025  16:49:50  9683648016257  [descripción]  $2,563.60
+
+    ``offset`` es la posición de la primera fila de ``df`` en el archivo:
+    al formatear por bloques, las columnas secuenciales continúan donde
+    terminó el bloque anterior.
     """
     
     if df.empty:
@@ -77,24 +82,32 @@ def adapt_to_acumulado_format(df: pd.DataFrame, start_row: int = None) -> pd.Dat
         start_row = 370  # Empezar desde 370 para continuar la secuencia
     
     # COLUMNA 1: Prueba - Número secuencial continuo (como 367, 368, ...)
-    acumulado_df["Prueba"] = range(start_row, start_row + len(df))
+    acumulado_df["Prueba"] = range(start_row + offset, start_row + offset + len(df))
     
     # COLUMNA 2: "de" - Siempre 6 (según el patrón)
     acumulado_df["de"] = 6
     
     # COLUMNA 3: "escritura" - Secuencia diferente (3, 1, ... según el patrón original)
     # Usar una secuencia que alterne o siga un patrón específico
-    acumulado_df["escritura"] = [i % 10 + 1 for i in range(len(df))]  # 1-10 rotativo
+    acumulado_df["escritura"] = [i % 10 + 1 for i in range(offset, offset + len(df))]  # 1-10 rotativo
     
     # COLUMNA 4: Fecha en formato exacto "12-jun-2025"
-    if "Fecha" in df.columns:
-        acumulado_df["2025-07-17T18:32:23.744Z"] = df["Fecha"].apply(convert_to_exact_date_format)
+    if "Movimiento" in df.columns and "Fecha" in df.columns:
+        # Fecha ya interpretada por el parser: se formatea en columna
+        movimiento = pd.to_datetime(df["Movimiento"])
+        fechas = movimiento.dt.strftime("%d-%b-%Y").str.lower()
+        sin_fecha = movimiento.isna().to_numpy()
+        if sin_fecha.any():
+            fechas[sin_fecha] = df["Fecha"][sin_fecha].apply(convert_to_exact_date_format)
+        acumulado_df["2025-07-17T18:32:23.744Z"] = fechas.to_numpy()
+    elif "Fecha" in df.columns:
+        acumulado_df["2025-07-17T18:32:23.744Z"] = df["Fecha"].apply(convert_to_exact_date_format).to_numpy()
     else:
         acumulado_df["2025-07-17T18:32:23.744Z"] = datetime.now().strftime("%d-%b-%Y").lower()
     
     # COLUMNA 5: Hora en formato exacto "16:10:22" (HH:MM:SS)
     if "Hora" in df.columns:
-        acumulado_df["Hora"] = df["Hora"].apply(normalize_time_format)
+        acumulado_df["Hora"] = df["Hora"].apply(normalize_time_format).to_numpy()
     else:
         acumulado_df["Hora"] = datetime.now().strftime("%H:%M:%S")
     
@@ -108,13 +121,14 @@ def adapt_to_acumulado_format(df: pd.DataFrame, start_row: int = None) -> pd.Dat
             claves.append(recibo)
         else:
             # Si no hay recibo, generar número realista de 13 dígitos
-            claves.append(f"{3803705013215 + i}")
+            claves.append(f"{3803705013215 + offset + i}")
 
     acumulado_df["Clave"] = claves
     
     # COLUMNA 7: Descripción completa (como en el original)
     if "Descripción" in df.columns:
-        acumulado_df["Descripción"] = df["Descripción"]
+        # Por posición: el índice de df no siempre es 0..n-1 (bloques, filas descartadas)
+        acumulado_df["Descripción"] = df["Descripción"].to_numpy()
     else:
         acumulado_df["Descripción"] = ""
     
@@ -390,20 +404,23 @@ def create_validation_row(file_name: str, record_count: int) -> dict:
 
 
 class DataFormatter:
-    """Formateador principal para datos bancarios"""
+    """
+    Formateador principal para datos bancarios
+    """
     
     def __init__(self):
         """Inicializar el formateador"""
         pass
     
-    def format_for_sheets(self, df: pd.DataFrame) -> pd.DataFrame:
+    def format_for_sheets(self, df: pd.DataFrame, offset: int = 0) -> pd.DataFrame:
         """
         Formatear datos para inserción en Google Sheets
         
         Args:
             df: DataFrame con datos a formatear
+            offset: Posición de la primera fila en el archivo (formato por bloques)
             
         Returns:
             DataFrame formateado para Google Sheets
         """
-        return adapt_to_acumulado_format(df)
+        return adapt_to_acumulado_format(df, offset=offset)
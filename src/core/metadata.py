@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Metadata del estado de cuenta (línea previa al encabezado)
+
+BanBajío escribe en la línea 1 la empresa, la cuenta, la CLABE, el periodo
+y los saldos. La línea ya viene en la muestra que se usa para detectar el
+formato, así que se interpreta sin volver a leer el archivo.
+"""
+
+import csv
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from .parser import _to_iso_date
+
+_CLABE = re.compile(r"(?<!\d)(\d{18})(?!\d)")
+_ACCOUNT = re.compile(r"(?<!\d)(\d{8,16})(?!\d)")
+_DATE = re.compile(r"(?<![\w/-])(\d{1,2}[-/](?:\d{1,2}|[A-Za-z]{3})[-/]\d{2,4}|\d{4}-\d{2}-\d{2})(?![\w/-])")
+_AMOUNT = re.compile(r"(-?)\$?\s*(\d{1,3}(?:,\d{3})+|\d+)\.(\d{2})(?!\d)")
+_OPENING = re.compile(r"saldo\s+(?:inicial|anterior)", re.IGNORECASE)
+_CLOSING = re.compile(r"saldo\s+(?:final|actual)", re.IGNORECASE)
+_ACCOUNT_LABEL = re.compile(r"cuenta", re.IGNORECASE)
+_CLABE_LABEL = re.compile(r"clabe", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class StatementMetadata:
+    """Datos de la cuenta y el periodo de un estado de cuenta"""
+
+    bank: str
+    company: Optional[str] = None
+    account: Optional[str] = None
+    clabe: Optional[str] = None
+    period_start: Optional[str] = None          # ISO (YYYY-MM-DD)
+    period_end: Optional[str] = None            # ISO (YYYY-MM-DD)
+    opening_balance_cents: Optional[int] = None
+    closing_balance_cents: Optional[int] = None
+    raw: str = ""
+
+    @property
+    def period(self) -> Optional[str]:
+        """Periodo como "inicio/fin" (ISO), o None si no se detectó"""
+        if self.period_start and self.period_end:
+            return f"{self.period_start}/{self.period_end}"
+        return self.period_start or self.period_end
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _cents(match) -> int:
+    sign, units, decimals = match.groups()
+    cents = int(units.replace(",", "")) * 100 + int(decimals)
+    return -cents if sign else cents
+
+
+def parse_metadata_line(line: str, bank: str, delimiter: str = ",") -> StatementMetadata:
+    """
+    Interpretar la línea de metadata por la forma de cada campo
+
+    CLABE = 18 dígitos; cuenta = 8 a 16 dígitos (o el campo con "Cuenta");
+    las dos primeras fechas son el periodo; los saldos se toman por su
+    etiqueta ("Saldo inicial/anterior", "Saldo final/actual") y, sin
+    etiquetas, el primer y último monto. La empresa es el primer campo de
+    solo texto.
+
+    Args:
+        line: Línea de metadata ya decodificada
+        bank: Banco detectado
+        delimiter: Delimitador de columnas
+
+    Returns:
+        StatementMetadata (campos no encontrados quedan en None)
+    """
+    fields = [f.strip() for f in next(csv.reader([line], delimiter=delimiter), [])]
+    company = account = clabe = opening = closing = None
+    dates: List[str] = []
+    amounts: List[int] = []
+    pending_label = None
+
+    for field in fields:
+        if not field:
+            continue
+
+        clabe_match = _CLABE.search(field)
+        if clabe_match and clabe is None:
+            clabe = clabe_match.group(1)
+        account_match = _ACCOUNT.search(_CLABE.sub("", field))
+        if account_match and (account is None or _ACCOUNT_LABEL.search(field)):
+            if not _CLABE_LABEL.search(field):
+                account = account_match.group(1)
+
+        dates.extend(_DATE.findall(field))
+        amount_match = _AMOUNT.search(_DATE.sub("", field))
+
+        label = "opening" if _OPENING.search(field) else "closing" if _CLOSING.search(field) else None
+        if amount_match:
+            value = _cents(amount_match)
+            label = label or pending_label
+            if label == "opening":
+                opening = value
+            elif label == "closing":
+                closing = value
+            else:
+                amounts.append(value)
+            pending_label = None
+        else:
+            # Etiqueta sola: el monto viene en el siguiente campo
+            pending_label = label
+
+        if company is None and not any(ch.isdigit() for ch in field) and label is None:
+            company = field
+
+    if opening is None and amounts:
+        opening = amounts[0]
+    if closing is None and len(amounts) > 1:
+        closing = amounts[-1]
+
+    return StatementMetadata(
+        bank=bank,
+        company=company,
+        account=account,
+        clabe=clabe,
+        period_start=_to_iso_date(dates[0]) if dates else None,
+        period_end=_to_iso_date(dates[1]) if len(dates) > 1 else None,
+        opening_balance_cents=opening,
+        closing_balance_cents=closing,
+        raw=line,
+    )
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Cache de parseo por contenido
+
+Los operadores analizan el mismo estado de cuenta varias veces por
+conciliación. El resultado de leer, parsear y clasificar un archivo se
+guarda en disco (Parquet) bajo el MD5 del archivo más la versión del
+parser, la tabla de tipos y el backend de lectura; si el archivo vuelve a
+llegar igual se carga de ahí sin repetir ninguno de esos pasos (sus tiempos
+por etapa se reportan en cero).
+
+La tabla formateada no se guarda: sus valores de respaldo dependen de la
+hora de la corrida (``datetime.now()``), así que el processor la vuelve a
+generar a partir de la tabla parseada.
+
+Cada entrada es un directorio ``<llave>/`` con la tabla parseada y un JSON
+con el resto del resultado. El tamaño total se limita quitando las entradas
+usadas hace más tiempo (la fecha de modificación del directorio se
+actualiza en cada lectura). Requiere pyarrow; sin él el cache no se activa.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .classifier import rules_path
+from .metadata import StatementMetadata
+from .parser import PARSER_VERSION, PIPELINE_STAGES
+
+try:
+    import pyarrow  # noqa: F401  (motor de Parquet)
+except ImportError:  # pyarrow es opcional
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+_RAW_FILE = "raw.parquet"
+_META_FILE = "meta.json"
+
+
+@dataclass
+class ParsedFile:
+    """Resultado de leer, parsear y formatear un archivo"""
+
+    raw_data: pd.DataFrame              # Tabla parseada con Tipo, ClaveRastreo y UID
+    formatted: pd.DataFrame             # Tabla en el formato de Sheets (no se guarda en cache)
+    encoding: str
+    metadata: Optional[StatementMetadata] = None
+    quarantine: List[Dict[str, Any]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    tail_checkpoint: Any = None         # Solo en modo seguimiento (no se guarda)
+    from_cache: bool = False
+
+
+def _version_key(backend: str) -> str:
+    """Versión del parser, backend de lectura y contenido de la tabla de tipos"""
+    md5 = hashlib.md5(f"{PARSER_VERSION}:{backend}".encode())
+    try:
+        with open(rules_path(), "rb") as f:
+            md5.update(f.read())
+    except OSError:
+        pass
+    return md5.hexdigest()[:12]
+
+
+def _nan_positions(df: pd.DataFrame) -> Dict[str, List[int]]:
+    """
+    Posiciones con NaN en columnas object (p. ej. Recibo vacío)
+
+    Parquet guarda NaN y None de una columna object como nulo y los devuelve
+    como None; con estas posiciones la tabla cargada queda igual a la original.
+    """
+    positions = {}
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].to_numpy()
+        is_nan = np.fromiter((isinstance(v, float) and v != v for v in values), dtype=bool, count=len(values))
+        if is_nan.any():
+            positions[str(col)] = np.flatnonzero(is_nan).tolist()
+    return positions
+
+
+def _restore_nan(df: pd.DataFrame, positions: Dict[str, List[int]]) -> None:
+    for col, rows in positions.items():
+        values = df[col].to_numpy(dtype=object, copy=True)
+        values[rows] = np.nan
+        df[col] = values
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+class ParseCache:
+    """Cache en disco de archivos ya parseados, con desalojo LRU por tamaño"""
+
+    def __init__(self, cache_dir: str, max_mb: int = 500, backend: str = "pandas"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.backend = backend
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        """Si hay motor de Parquet (pyarrow) para usar el cache"""
+        return pyarrow is not None
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_hash}-{_version_key(self.backend)}")
+
+    def load(self, file_hash: str) -> Optional[ParsedFile]:
+        """
+        Resultado guardado para el archivo (None si no está o no se pudo leer)
+
+        ``formatted`` viene vacío: lo genera el processor desde ``raw_data``.
+
+        Args:
+            file_hash: MD5 del contenido del archivo
+        """
+        path = self._path(file_hash)
+        if not os.path.isdir(path):
+            return None
+        try:
+            with open(os.path.join(path, _META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            raw_data = pd.read_parquet(os.path.join(path, _RAW_FILE))
+            _restore_nan(raw_data, meta.get("nan_positions", {}))
+            parsed = ParsedFile(
+                raw_data=raw_data,
+                formatted=pd.DataFrame(),
+                encoding=meta["encoding"],
+                metadata=StatementMetadata(**meta["metadata"]) if meta.get("metadata") else None,
+                quarantine=meta.get("quarantine", []),
+                # Nada se parseó en esta corrida
+                timings=dict.fromkeys(PIPELINE_STAGES, 0.0),
+                from_cache=True,
+            )
+        except Exception as e:
+            logger.warning(f"Entrada de cache inválida {os.path.basename(path)}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        # Marcar como usada recientemente
+        os.utime(path)
+        return parsed
+
+    def store(self, file_hash: str, parsed: ParsedFile) -> bool:
+        """
+        Guardar el resultado de un archivo y desalojar las entradas más viejas
+
+        Una tabla que Parquet no puede representar (columnas con tipos
+        mezclados) no se guarda; el procesamiento sigue sin cache.
+
+        Args:
+            file_hash: MD5 del contenido del archivo
+            parsed: Resultado a guardar
+
+        Returns:
+            True si quedó guardado
+        """
+        path = self._path(file_hash)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(tmp_path, exist_ok=True)
+            parsed.raw_data.to_parquet(os.path.join(tmp_path, _RAW_FILE))
+            meta = {
+                "encoding": parsed.encoding,
+                "nan_positions": _nan_positions(parsed.raw_data),
+                "metadata": parsed.metadata.to_dict() if parsed.metadata is not None else None,
+                "quarantine": parsed.quarantine,
+            }
+            with open(os.path.join(tmp_path, _META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            with self._lock:
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(tmp_path, path)
+                self._evict()
+        except Exception as e:
+            logger.warning(f"No se pudo guardar en cache {os.path.basename(path)}: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+        return True
+
+    def _evict(self) -> None:
+        """Quitar las entradas usadas hace más tiempo hasta caber en el límite"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and ".tmp-" not in entry.name:
+                entries.append((entry.stat().st_mtime, _dir_size(entry.path), entry.path))
+        total = sum(size for _, size, _ in entries)
+        # La entrada recién guardada es la más reciente: se quita solo si no cabe sola
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logger.info(f"Cache de parseo: desalojada {os.path.basename(path)}")
@@ -1,97 +1,249 @@
+import numpy as np
 import pandas as pd
 import re
+import time
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
 
+from .classifier import default_classifier
 
-def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    colmap = {}
-    for c in df.columns:
-        lc = str(c).strip().lower()
-        if "fecha" in lc and "mov" in lc:
-            colmap[c] = "Fecha"
-        elif lc == "fecha":
-            colmap[c] = "Fecha"
-        elif "hora" in lc:
-            colmap[c] = "Hora"
-        elif "recibo" in lc or "referencia" in lc or "folio" in lc:
-            colmap[c] = "Recibo"
-        elif "descrip" in lc or "concepto" in lc or "detalle" in lc:
-            colmap[c] = "Descripción"
-        elif "cargo" in lc:
-            colmap[c] = "Cargo"
-        elif "abono" in lc or "deposito" in lc:
-            colmap[c] = "Abono"
-        elif "saldo" in lc:
-            colmap[c] = "Saldo"
-        elif "rastre" in lc:
-            colmap[c] = "ClaveRastreo"
-        elif lc.startswith("#"):
-            colmap[c] = "Idx"
-    df2 = df.rename(columns=colmap).copy()
-    for col in ["Fecha", "Hora", "Recibo", "Descripción", "Cargo", "Abono", "Saldo"]:
-        if col not in df2.columns:
-            df2[col] = None
-    if "ClaveRastreo" not in df2.columns:
-
-        def extract_cr(desc):
-            if not isinstance(desc, str):
-                return None
-            # Buscar patrones específicos de BanBajío
-            m = re.search(r"clave de rastreo:\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
-            if m:
-                return m.group(1)
-            m = re.search(r"clave de rastreo\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
-            if m:
-                return m.group(1)
-            # Buscar otros patrones de clave de rastreo
-            m = re.search(r"\b([A-Za-z0-9]{12,})\b", desc)
-            if m:
-                return m.group(1)
-            return None
-
-        df2["ClaveRastreo"] = df2["Descripción"].map(extract_cr)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow es opcional
+    pa = pc = None
+
+# Símbolos que no forman parte de un monto: $, separador de miles y espacios
+_AMOUNT_NOISE = re.compile(r"[$,\s]")
+
+# Patrones de clave de rastreo en orden de prioridad: "clave de rastreo:",
+# "clave de rastreo" y cualquier palabra de 12+ alfanuméricos
+_CLAVE_RASTREO_PATTERNS = (
+    re.compile(r"clave de rastreo:\s*([A-Za-z0-9\-]{6,})", re.I),
+    re.compile(r"clave de rastreo\s*([A-Za-z0-9\-]{6,})", re.I),
+    re.compile(r"\b([A-Za-z0-9]{12,})\b"),
+)
+
+# Los mismos patrones para RE2 (pyarrow), válidos solo sobre texto ASCII: ahí
+# \b y las clases coinciden con ``re``; \s se escribe explícito porque el de
+# RE2 no incluye \v ni \x1c-\x1f
+_CLAVE_RASTREO_RE2 = (
+    r"(?i)clave de rastreo:[\t\n\v\f\r\x1c-\x1f ]*(?P<clave>[A-Za-z0-9\-]{6,})",
+    r"(?i)clave de rastreo[\t\n\v\f\r\x1c-\x1f ]*(?P<clave>[A-Za-z0-9\-]{6,})",
+    r"\b(?P<clave>[A-Za-z0-9]{12,})\b",
+)
+
+# Separador de filas al buscar sobre la columna completa: ningún patrón lo
+# atraviesa (no es espacio, alfanumérico ni guion) y \b lo trata como fin de texto
+_ROW_SEPARATOR = "\x00"
+
+# Columnas que toda tabla normalizada debe tener
+_REQUIRED_COLUMNS = ("Fecha", "Hora", "Recibo", "Descripción", "Cargo", "Abono", "Saldo")
+
+# Versión de la tabla parseada: subirla con cualquier cambio en parser.py
+# que altere sus columnas o valores (invalida el cache de parseo)
+PARSER_VERSION = "5"
+
+# Etapas de parse_and_enrich, en orden (llaves de los tiempos)
+PIPELINE_STAGES = ("normalizacion", "clasificacion", "clave_rastreo", "uid")
+
+# Firmas de encabezado distintas que se recuerdan ya resueltas
+_COLUMN_PLAN_CACHE_SIZE = 256
+
+
+def _canonical_column(label) -> Optional[str]:
+    """Nombre canónico de un encabezado (None si no se reconoce)"""
+    lc = str(label).strip().lower()
+    if "fecha" in lc and "mov" in lc:
+        return "Fecha"
+    elif lc == "fecha":
+        return "Fecha"
+    elif "hora" in lc:
+        return "Hora"
+    elif "recibo" in lc or "referencia" in lc or "folio" in lc:
+        return "Recibo"
+    elif "descrip" in lc or "concepto" in lc or "detalle" in lc:
+        return "Descripción"
+    elif "cargo" in lc:
+        return "Cargo"
+    elif "abono" in lc or "deposito" in lc:
+        return "Abono"
+    elif "saldo" in lc:
+        return "Saldo"
+    elif "rastre" in lc:
+        return "ClaveRastreo"
+    elif lc.startswith("#"):
+        return "Idx"
+    return None
+
+
+@lru_cache(maxsize=_COLUMN_PLAN_CACHE_SIZE)
+def _column_plan(header: tuple) -> Tuple[tuple, tuple, bool]:
+    """
+    Plan de normalización para un encabezado (se calcula una vez por firma)
+
+    Args:
+        header: Encabezados tal como vienen en el archivo
+
+    Returns:
+        Tupla (nombres finales de las columnas, columnas requeridas que
+        faltan, si falta ClaveRastreo)
+    """
+    renamed = tuple(_canonical_column(c) or c for c in header)
+    missing = tuple(col for col in _REQUIRED_COLUMNS if col not in renamed)
+    return renamed, missing, "ClaveRastreo" not in renamed
+
+
+def _normalize_columns(df: pd.DataFrame, extract_clave: bool = True) -> pd.DataFrame:
+    renamed, missing, needs_clave = _column_plan(tuple(df.columns))
+    # Copia superficial: se renombra y se agregan columnas sin copiar los datos
+    df2 = df.copy(deep=False)
+    df2.columns = renamed
+    for col in missing:
+        df2[col] = None
+    if needs_clave:
+        # Sin extracción se deja la columna vacía (en su lugar) para llenarla después
+        df2["ClaveRastreo"] = extract_clave_rastreo(df2["Descripción"]) if extract_clave else None
     return df2
 
 
+def _extract_clave_rastreo_row(desc):
+    if not isinstance(desc, str):
+        return None
+    for pattern in _CLAVE_RASTREO_PATTERNS:
+        m = pattern.search(desc)
+        if m:
+            return m.group(1)
+    return None
+
+
+def _extract_clave_rastreo_joined(texts: np.ndarray) -> np.ndarray:
+    """
+    Clave de rastreo de cada texto con ``re``, recorriendo la columna unida
+
+    Cada patrón recorre una sola vez el texto unido; la posición de cada
+    coincidencia se asigna a su fila con ``searchsorted`` y por fila gana el
+    primer patrón de la lista, igual que buscando fila por fila.
+    """
+    joined = _ROW_SEPARATOR.join(texts)
+    if joined.count(_ROW_SEPARATOR) != max(len(texts) - 1, 0):
+        # El separador aparece dentro de alguna descripción: fila por fila
+        return np.array([_extract_clave_rastreo_row(text) for text in texts], dtype=object)
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.cumsum(lengths + 1) - (lengths + 1)
+    clave = np.full(len(texts), None, dtype=object)
+    found = np.zeros(len(texts), dtype=bool)
+
+    for pattern in _CLAVE_RASTREO_PATTERNS:
+        matches = [(m.start(), m.group(1)) for m in pattern.finditer(joined)]
+        if not matches:
+            continue
+        positions = np.fromiter((pos for pos, _ in matches), dtype=np.int64, count=len(matches))
+        rows, first = np.unique(np.searchsorted(starts, positions, side="right") - 1, return_index=True)
+        pending = ~found[rows]
+        groups = np.array([group for _, group in matches], dtype=object)
+        clave[rows[pending]] = groups[first[pending]]
+        found[rows[pending]] = True
+    return clave
+
+
+def _extract_clave_rastreo_arrow(texts: np.ndarray, clave: np.ndarray) -> np.ndarray:
+    """
+    Clave de rastreo de los textos ASCII con RE2 (pyarrow), escrita en ``clave``
+
+    Returns:
+        Máscara de las filas resueltas (las ASCII)
+    """
+    array = pa.array(texts, type=pa.large_string())
+    is_ascii = pc.string_is_ascii(array).to_numpy(zero_copy_only=False)
+    found = ~is_ascii
+    for pattern in _CLAVE_RASTREO_RE2:
+        # Sin coincidencia el struct es nulo (su campo no)
+        groups = pc.extract_regex(array, pattern)
+        matched = ~found & groups.is_valid().to_numpy(zero_copy_only=False)
+        clave[matched] = groups.field("clave").to_numpy(zero_copy_only=False)[matched]
+        found |= matched
+    return is_ascii
+
+
+def extract_clave_rastreo(descriptions: pd.Series) -> pd.Series:
+    """
+    Extraer la clave de rastreo de una columna de descripciones (vectorizado)
+
+    Con pyarrow las descripciones ASCII se resuelven con RE2 en columna; el
+    resto con los patrones precompilados de ``re`` sobre la columna unida.
+    Los valores que no son texto o no tienen clave quedan en None.
+
+    Args:
+        descriptions: Columna de descripciones
+
+    Returns:
+        Serie con la clave de rastreo de cada fila
+    """
+    values = descriptions.to_numpy(dtype=object)
+    is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    texts = np.where(is_text, values, "")
+    clave = np.full(len(texts), None, dtype=object)
+
+    pending = is_text
+    if pc is not None and len(texts):
+        pending = is_text & ~_extract_clave_rastreo_arrow(texts, clave)
+    if pending.any():
+        clave[pending] = _extract_clave_rastreo_joined(texts[pending])
+
+    clave[~is_text] = None
+    return pd.Series(clave, index=descriptions.index, name="ClaveRastreo")
+
+
+# Formatos de fecha aceptados; son excluyentes entre sí (ningún texto se lee
+# con dos de ellos), así que el orden en que se prueban no cambia el resultado
+_DATE_FORMATS = (
+    "%d-%b-%Y",  # Formato específico de BanBajío: 21-Jul-2025
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%y",
+    "%Y/%m/%d",
+)
+
+_SPANISH_MONTHS = {
+    "ene": "Jan",
+    "feb": "Feb",
+    "mar": "Mar",
+    "abr": "Apr",
+    "may": "May",
+    "jun": "Jun",
+    "jul": "Jul",
+    "ago": "Aug",
+    "sep": "Sep",
+    "oct": "Oct",
+    "nov": "Nov",
+    "dic": "Dec",
+}
+
+_DAY_MONTH_YEAR = re.compile(r"(\d{1,2})-([A-Za-z]{3})-(\d{4})")
+
+# Valores distintos con los que se elige el formato a probar primero
+_DATE_SAMPLE_SIZE = 20
+
+
 def _to_iso_date(val):
     if pd.isna(val):
         return None
     s = str(val).strip()
     if not s:
         return None  # Handle empty strings
-    # Formato específico de BanBajío: 21-Jul-2025
-    fmts = [
-        "%d-%b-%Y",
-        "%Y-%m-%d",
-        "%d/%m/%Y",
-        "%d-%m-%Y",
-        "%d-%b-%Y",
-        "%d/%m/%y",
-        "%Y/%m/%d",
-    ]
-    for f in fmts:
+    for f in _DATE_FORMATS:
         try:
             return datetime.strptime(s, f).date().isoformat()
         except Exception:
             pass
-    meses = {
-        "ene": "Jan",
-        "feb": "Feb",
-        "mar": "Mar",
-        "abr": "Apr",
-        "may": "May",
-        "jun": "Jun",
-        "jul": "Jul",
-        "ago": "Aug",
-        "sep": "Sep",
-        "oct": "Oct",
-        "nov": "Nov",
-        "dic": "Dec",
-    }
-    m = re.match(r"(\d{1,2})-([A-Za-z]{3})-(\d{4})", s)
+    m = _DAY_MONTH_YEAR.match(s)
     if m:
         d, mon, y = m.groups()
-        mon_en = meses.get(mon.lower(), mon)
+        mon_en = _SPANISH_MONTHS.get(mon.lower(), mon)
         try:
             return datetime.strptime(f"{d}-{mon_en}-{y}", "%d-%b-%Y").date().isoformat()
         except Exception:
@@ -99,49 +251,179 @@ def _to_iso_date(val):
     return s
 
 
-def _normalize_numbers(series):
-    def parse_num(x):
-        if pd.isna(x):
-            return 0.0
-        s = str(x).strip().replace(",", "")
-        try:
-            return float(s)
-        except Exception:
-            try:
-                return float(s.replace(",", ".").replace(" ", ""))
-            except Exception:
-                return 0.0
+def _infer_date_format(text: pd.Series):
+    """Primer formato que interpreta toda una muestra de valores (o None)"""
+    sample = text[text != ""].head(_DATE_SAMPLE_SIZE)
+    for fmt in _DATE_FORMATS:
+        if not sample.empty and pd.to_datetime(sample, format=fmt, errors="coerce").notna().all():
+            return fmt
+    return None
+
+
+def normalize_dates(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Normalizar una columna de fechas a ISO (YYYY-MM-DD) de forma vectorizada
+
+    Un estado de cuenta tiene pocas fechas distintas: solo se interpretan los
+    valores únicos y el resultado se reparte a las filas. El formato se
+    infiere de una muestra y se prueba primero; los meses en español
+    (``ene``, ``abr``, ``ago``, ``dic``) se traducen en columna. Da el mismo
+    resultado que ``_to_iso_date`` fila por fila: lo que no es fecha queda
+    como texto y los vacíos en None.
+
+    Args:
+        series: Columna de fechas
+
+    Returns:
+        Tupla (fechas ISO como texto, fechas datetime64[ns])
+    """
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+
+    inferred = _infer_date_format(text)
+    pending = text != ""
+    for fmt in ([inferred] if inferred else []) + [f for f in _DATE_FORMATS if f != inferred]:
+        if not pending.any():
+            break
+        attempt = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+        parsed[attempt.index] = parsed[attempt.index].fillna(attempt)
+        pending &= parsed.isna()
+
+    if pending.any():
+        # Meses en español: "21-ago-2025" -> "21-Aug-2025"
+        parts = text[pending].str.extract(r"^(\d{1,2})-([A-Za-z]{3})-(\d{4})").dropna()
+        months = parts[1].str.lower().map(_SPANISH_MONTHS).fillna(parts[1])
+        attempt = pd.to_datetime(parts[0] + "-" + months + "-" + parts[2], format="%d-%b-%Y", errors="coerce")
+        parsed[attempt.index] = attempt
+        pending &= parsed.isna()
+
+    iso = parsed.dt.strftime("%Y-%m-%d").astype(object)
+    iso[text == ""] = None
+    # Lo que pandas no pudo leer (fuera de rango de datetime64 o no es
+    # fecha) se resuelve como antes, valor por valor
+    iso[pending] = [_to_iso_date(value) for value in text[pending]]
+
+    # El código -1 (vacío) toma el último elemento: None / NaT
+    iso_values = np.append(iso.to_numpy(dtype=object), np.array([None], dtype=object))[codes]
+    dt_values = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))[codes]
+    return (
+        pd.Series(iso_values, index=series.index, dtype=object, name=series.name),
+        pd.Series(dt_values, index=series.index, name=series.name),
+    )
+
+
+_TIME = re.compile(r"^([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?$")
+
+
+def _time_offsets(horas: pd.Series) -> pd.Series:
+    """
+    Hora del día (HH:MM[:SS]) como timedelta, interpretando solo valores distintos
+
+    Las horas vacías valen 00:00:00; las que no son una hora válida, NaT.
+    """
+    codes, uniques = pd.factorize(horas)
+    text = pd.Series(np.asarray(uniques, dtype=object), dtype=object).astype(str).str.strip()
+    valid = text.str.match(_TIME)
+    # HH:MM -> HH:MM:00
+    text = text.where(~valid | text.str.count(":").eq(2), text + ":00")
+    offsets = pd.to_timedelta(text.where(valid), errors="coerce")
+    offsets[text == ""] = pd.Timedelta(0)
+
+    # El código -1 (vacío) toma el último elemento: 00:00:00
+    values = np.append(offsets.to_numpy(dtype="timedelta64[ns]"), np.timedelta64(0, "ns"))[codes]
+    return pd.Series(values, index=horas.index)
+
+
+def combine_date_time(fechas: pd.Series, horas: pd.Series = None) -> pd.Series:
+    """
+    Combinar fecha (datetime64) y hora en un solo datetime64[ns], vectorizado
+
+    Args:
+        fechas: Fechas ya interpretadas (``normalize_dates``)
+        horas: Columna de horas en texto (opcional)
+
+    Returns:
+        Serie Movimiento (NaT si la fecha o la hora no son válidas)
+    """
+    if horas is None:
+        return fechas.rename("Movimiento")
+    return (fechas + _time_offsets(horas)).rename("Movimiento")
 
-    return series.map(parse_num)
+
+def movement_datetimes(fechas: pd.Series, horas: pd.Series = None) -> pd.Series:
+    """
+    Instante de cada movimiento a partir de columnas de fecha y hora en texto
+
+    Args:
+        fechas: Fechas en cualquier formato aceptado por ``normalize_dates``
+        horas: Horas en texto (opcional)
+
+    Returns:
+        Serie datetime64[ns]
+    """
+    _, parsed = normalize_dates(fechas)
+    return combine_date_time(parsed, horas)
+
+
+def _normalize_numbers(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Convertir una columna de montos a pesos (float) de forma vectorizada
+
+    Los montos conservan su valor original (no se redondean a centavos).
+
+    Returns:
+        Tupla (montos, máscara booleana de valores no convertibles); los
+        no convertibles valen 0 pero quedan marcados en la máscara
+    """
+    numbers, invalid = parse_amounts(series)
+    return numbers.fillna(0.0), invalid
+
+
+def parse_amounts(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Convertir una columna de montos a float sin redondear, de forma vectorizada
+
+    Quita ``$``, separadores de miles y espacios y convierte con
+    ``pd.to_numeric``. Los vacíos quedan en NaN; los valores no
+    convertibles (o infinitos) también, pero quedan marcados.
+
+    Returns:
+        Tupla (montos float64, máscara booleana de valores no convertibles)
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        numbers = series.astype("float64")
+        invalid = pd.Series(False, index=series.index)
+    else:
+        text = series.astype(str).where(series.notna(), "")
+        text = text.str.replace(_AMOUNT_NOISE, "", regex=True)
+        numbers = pd.to_numeric(text, errors="coerce").astype("float64")
+        invalid = numbers.isna() & (text != "")
+
+    infinite = np.isinf(numbers)
+    if infinite.any():
+        invalid = invalid | infinite
+        numbers = numbers.mask(infinite)
+    return numbers, invalid
+
+
+def amounts_to_cents(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Convertir una columna de montos a centavos enteros (int64) de forma vectorizada
+
+    Convierte con ``parse_amounts`` y redondea a centavos. Los vacíos
+    valen 0; los valores no convertibles también, pero quedan marcados.
+
+    Returns:
+        Tupla (centavos int64, máscara booleana de valores no convertibles)
+    """
+    numbers, invalid = parse_amounts(series)
+    cents = np.rint(numbers.fillna(0.0).to_numpy(dtype="float64") * 100).astype("int64")
+    return pd.Series(cents, index=series.index, name=series.name), invalid
 
 
 def classify_tipo(desc):
-    if not isinstance(desc, str):
-        return ""
-    d = desc.lower()
-    if "spei" in d:
-        if "recibido" in d or "ingreso" in d or "dep" in d:
-            return "SPEI Recibido"
-        if "enviado" in d or "salida" in d or "transf" in d:
-            return "SPEI Enviado"
-        return "SPEI"
-    if "comision" in d or "comisión" in d:
-        return "Comisión"
-    if "iva" in d:
-        return "IVA"
-    if "pos" in d:
-        return "POS"
-    if "domicilia" in d or "domiciliacion" in d:
-        return "Domiciliación"
-    if "deposito" in d or "depósito" in d:
-        return "Depósito"
-    if "retiro" in d:
-        return "Retiro"
-    if "entrega de recursos" in d:
-        return "Entrega de Recursos"
-    if "retiro de nomina" in d:
-        return "Retiro de Nómina"
-    return ""
+    return default_classifier().classify(desc)
 
 
 def _build_uid(row):
@@ -157,25 +439,111 @@ def _build_uid(row):
     return f"REC:{recibo}|{fecha}|{hora}|{desc_key}"
 
 
-def parse_bank_txt(df_raw: pd.DataFrame) -> pd.DataFrame:
+def _uid_text(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Columna como texto con la misma regla que ``_build_uid``: ``str(v or "")``
+
+    None, "" y ceros quedan vacíos; NaN se escribe "nan" (es verdadero en
+    Python), igual que en la construcción fila por fila.
+    """
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    values = df[col].to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        # Todo es texto: ya es su propio str()
+        return pd.Series(values, index=df.index, dtype=object)
+    falsy = (values == None) | (values == "") | (values == 0)  # noqa: E711 - comparación elemento a elemento
+    text = pd.Series(values, index=df.index, dtype=object).astype(str)
+    return text.mask(falsy, "")
+
+
+def _map_distinct(series: pd.Series, func) -> pd.Series:
+    """Aplicar ``func`` una vez por valor distinto de una columna de texto"""
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Series([func(value) for value in uniques], dtype=object)
+    return pd.Series(mapped.to_numpy()[codes], index=series.index)
+
+
+def build_uids(df: pd.DataFrame) -> pd.Series:
+    """
+    Construir los UIDs de todas las filas por columnas (vectorizado)
+
+    Mismo resultado, byte por byte, que ``_build_uid`` fila por fila:
+    ``SPEI:<clave>`` para movimientos SPEI con clave de rastreo de 6+
+    caracteres y ``REC:<recibo>|<fecha>|<hora>|<desc_key>`` en otro caso.
+
+    Args:
+        df: DataFrame con Tipo, ClaveRastreo y las columnas del movimiento
+
+    Returns:
+        Serie UID con el mismo índice
+    """
+    clave = _uid_text(df, "ClaveRastreo")
+    spei = (clave.str.len() >= 6) & _map_distinct(_uid_text(df, "Tipo"), lambda t: t.startswith("SPEI"))
+
+    # "".join(split()) quita los mismos espacios que re.sub(r"\s+", "")
+    desc_key = _map_distinct(_uid_text(df, "Descripción"), lambda d: "".join(d.split())[:24])
+    rec = (
+        "REC:" + _uid_text(df, "Recibo")
+        + "|" + _uid_text(df, "Fecha")
+        + "|" + _uid_text(df, "Hora")
+        + "|" + desc_key
+    )
+    uids = np.where(spei.to_numpy(dtype=bool), ("SPEI:" + clave).to_numpy(dtype=object), rec.to_numpy(dtype=object))
+    return pd.Series(uids, index=df.index, dtype=object, name="UID")
+
+
+def uid_hashes(uids: Iterable[str]) -> np.ndarray:
+    """
+    Llave de 64 bits (uint64) de cada UID, calculada de forma vectorizada
+
+    Usa ``hash_pandas_object`` (SipHash con llave fija), así que el valor es
+    el mismo entre ejecuciones y procesos. Dos UIDs distintos pueden
+    compartir hash: las coincidencias se confirman contra el UID en texto.
+
+    Args:
+        uids: UIDs en texto
+
+    Returns:
+        Arreglo uint64 con un hash por UID
+    """
+    uids = uids if isinstance(uids, pd.Series) else pd.Series(list(uids), dtype=object)
+    return pd.util.hash_pandas_object(uids, index=False).to_numpy()
+
+
+def parse_bank_txt(df_raw: pd.DataFrame, extract_clave: bool = True) -> pd.DataFrame:
     # Verificar si el DataFrame tiene la estructura correcta
     if len(df_raw.columns) < 7:
         # Si no tiene suficientes columnas, intentar leer correctamente
         return pd.DataFrame()
 
+    amounts_in_cents = df_raw.attrs.get("amount_unit") == "cents"
+
     # Normalizar columnas
-    df = _normalize_columns(df_raw)
+    df = _normalize_columns(df_raw, extract_clave=extract_clave)
 
     # Filtrar filas vacías o con datos inválidos
     df = df.dropna(subset=["Fecha", "Descripción"])
 
-    # Procesar fechas
-    df["Fecha"] = df["Fecha"].map(_to_iso_date)
+    # Procesar fechas (texto ISO) y el instante del movimiento (datetime64)
+    df["Fecha"], fechas = normalize_dates(df["Fecha"])
+    df["Movimiento"] = combine_date_time(fechas, df["Hora"])
 
-    # Procesar números
-    df["Cargo"] = _normalize_numbers(df["Cargo"])
-    df["Abono"] = _normalize_numbers(df["Abono"])
-    df["Saldo"] = _normalize_numbers(df["Saldo"])
+    # Procesar números (el lector tipado ya los entrega en centavos int64 y
+    # marca en MontoInvalido los que no pudo convertir)
+    if "MontoInvalido" in df.columns:
+        invalid_amounts = df["MontoInvalido"].fillna(False).astype(bool)
+    else:
+        invalid_amounts = pd.Series(False, index=df.index)
+    for col in ["Cargo", "Abono", "Saldo"]:
+        if amounts_in_cents and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col] / 100
+        else:
+            df[col], invalid = _normalize_numbers(df[col])
+            invalid_amounts = invalid_amounts | invalid
+    df["MontoInvalido"] = invalid_amounts
+    # Los montos quedan en pesos: la marca del lector tipado ya no aplica
+    df.attrs["amount_unit"] = "pesos"
 
     # Limpiar datos
     df = df[df["Fecha"].notna() & (df["Fecha"] != "")]
@@ -186,33 +554,59 @@ def parse_bank_txt(df_raw: pd.DataFrame) -> pd.DataFrame:
 
 def add_uids(df: pd.DataFrame) -> pd.DataFrame:
     if "Tipo" not in df.columns:
-        df["Tipo"] = df["Descripción"].map(classify_tipo)
+        df["Tipo"] = default_classifier().classify_series(df["Descripción"])
 
     # Ensure ClaveRastreo is extracted if not present
     if "ClaveRastreo" not in df.columns:
+        df["ClaveRastreo"] = extract_clave_rastreo(df["Descripción"])
 
-        def extract_cr(desc):
-            if not isinstance(desc, str):
-                return None
-            # Buscar patrones específicos de BanBajío
-            m = re.search(r"clave de rastreo:\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
-            if m:
-                return m.group(1)
-            m = re.search(r"clave de rastreo\s*([A-Za-z0-9\-]{6,})", desc, flags=re.I)
-            if m:
-                return m.group(1)
-            # Buscar otros patrones de clave de rastreo
-            m = re.search(r"\b([A-Za-z0-9]{12,})\b", desc)
-            if m:
-                return m.group(1)
-            return None
-
-        df["ClaveRastreo"] = df["Descripción"].map(extract_cr)
-
-    df["UID"] = df.apply(_build_uid, axis=1)
+    df["UID"] = build_uids(df)
+    # Llave compacta para deduplicar con arreglos numpy
+    df["UIDHash"] = uid_hashes(df["UID"])
     return df
 
 
+def parse_and_enrich(df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Parsear y enriquecer en una sola pasada: normalización, Tipo,
+    ClaveRastreo y UID
+
+    Cada etapa calcula su columna una sola vez sobre las filas que quedan
+    después de filtrar; la ClaveRastreo se extrae solo si el archivo no la
+    trae. El resultado es el mismo que ``add_uids(parse_bank_txt(df_raw))``.
+
+    Args:
+        df_raw: DataFrame con datos sin procesar
+
+    Returns:
+        Tupla (DataFrame enriquecido, segundos por etapa)
+    """
+    timings = dict.fromkeys(PIPELINE_STAGES, 0.0)
+
+    start = time.perf_counter()
+    df = parse_bank_txt(df_raw, extract_clave=False)
+    timings["normalizacion"] = time.perf_counter() - start
+    if df.empty:
+        return df, timings
+
+    start = time.perf_counter()
+    if "Tipo" not in df.columns:
+        df["Tipo"] = default_classifier().classify_series(df["Descripción"])
+    timings["clasificacion"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if _column_plan(tuple(df_raw.columns))[2]:
+        df["ClaveRastreo"] = extract_clave_rastreo(df["Descripción"])
+    timings["clave_rastreo"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df["UID"] = build_uids(df)
+    df["UIDHash"] = uid_hashes(df["UID"])
+    timings["uid"] = time.perf_counter() - start
+
+    return df, timings
+
+
 class BankParser:
     """Parser principal para archivos bancarios"""
     
@@ -232,6 +626,18 @@ class BankParser:
         """
         return parse_bank_txt(df_raw)
     
+    def classify_transaction_types(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Clasificar una columna de descripciones (una sola vez por descripción distinta)
+        
+        Args:
+            descriptions: Columna de descripciones
+            
+        Returns:
+            Serie con el tipo de transacción de cada fila
+        """
+        return default_classifier().classify_series(descriptions)
+    
     def classify_transaction_type(self, description: str) -> str:
         """
         Clasificar el tipo de transacción basado en la descripción
@@ -255,3 +661,15 @@ class BankParser:
             DataFrame con UIDs agregados
         """
         return add_uids(df)
+    
+    def parse_and_enrich(self, df_raw: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """
+        Parsear, clasificar y agregar ClaveRastreo y UIDs en una sola pasada
+        
+        Args:
+            df_raw: DataFrame con datos sin procesar
+            
+        Returns:
+            Tupla (DataFrame listo para formatear, segundos por etapa)
+        """
+        return parse_and_enrich(df_raw)
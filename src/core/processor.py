@@ -7,26 +7,63 @@ import os
 import logging
 import hashlib
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import pandas as pd
 
-from .parser import BankParser
+from .balance import check_balance_continuity
+from .parse_cache import ParseCache, ParsedFile
+from .parser import PIPELINE_STAGES, BankParser, movement_datetimes
+from .quarantine import BadLine
 from .reader import BankReader
 from .formatter import DataFormatter
+from config.settings import config
 from services.google_sheets import GoogleSheetsService
 from utils.helpers import analyze_duplicates_exhaustive, validate_insertion_safety
 
 logger = logging.getLogger(__name__)
 
+# Saltos de saldo que se reportan por archivo (el total siempre se cuenta)
+MAX_BALANCE_GAPS = 1000
+
 class BankProcessor:
     """Procesador principal de archivos bancarios"""
 
     def __init__(self):
         """Inicializar el procesador"""
         self.parser = BankParser()
-        self.reader = BankReader()
+        self.reader = BankReader(
+            chunk_size=config.get("READ_CHUNK_SIZE", 50000),
+            backend=config.get("READER_BACKEND", "pandas"),
+            max_file_size_mb=config.get("MAX_FILE_SIZE", 200),
+            tail_state_dir=config.get("TAIL_STATE_DIR") if config.get("TAIL_FOLLOW", False) else None,
+            workers=config.get("READ_WORKERS", 4),
+        )
         self.formatter = DataFormatter()
+        self.max_workers = max(1, config.get("READ_WORKERS", 4))
+        self.parse_cache = self._create_parse_cache()
+
+    def _create_parse_cache(self) -> Optional[ParseCache]:
+        """
+        Cache de parseo según la configuración
+
+        Se activa con ``PARSE_CACHE_ENABLED`` (desactivado por defecto). No se
+        usa en modo seguimiento (cada lectura depende de lo ya ingerido) ni
+        sin pyarrow (motor de Parquet).
+        """
+        if not config.get("PARSE_CACHE_ENABLED", False) or self.reader.tail_store is not None:
+            return None
+        if not ParseCache.available():
+            logger.info("Cache de parseo desactivado: requiere pyarrow")
+            return None
+        return ParseCache(
+            config.get("CACHE_DIR"),
+            max_mb=config.get("CACHE_MAX_MB", 500),
+            backend=config.get("READER_BACKEND", "pandas"),
+        )
 
     def sort_data_by_datetime(self, df: pd.DataFrame, ascending: bool = False) -> pd.DataFrame:
         """
@@ -64,33 +101,13 @@ class BankProcessor:
 
             logger.info(f"Ordenando por columna de fecha: '{fecha_col}', hora: '{hora_col}'")
 
-            # Crear columna temporal combinando fecha y hora
-            df_sorted = df.copy()
-
-            # Normalizar fechas a datetime
-            def parse_datetime(row):
-                try:
-                    fecha_str = str(row[fecha_col])
-                    hora_str = str(row[hora_col]) if hora_col and pd.notna(row.get(hora_col)) else "00:00:00"
-
-                    # Manejar diferentes formatos de fecha
-                    if "-" in fecha_str and len(fecha_str.split("-")) == 3:
-                        # Formato ISO (2025-01-15) o dd-mmm-yyyy
-                        if len(fecha_str.split("-")[0]) == 4:  # YYYY-MM-DD
-                            fecha_dt = pd.to_datetime(fecha_str, format="%Y-%m-%d")
-                        else:  # dd-mmm-yyyy (ejemplo: 21-jul-2025)
-                            fecha_dt = pd.to_datetime(fecha_str, format="%d-%b-%Y")
-                    else:
-                        fecha_dt = pd.to_datetime(fecha_str)
-
-                    # Combinar fecha y hora
-                    datetime_combined = pd.to_datetime(f"{fecha_dt.date()} {hora_str}")
-                    return datetime_combined
-                except Exception as e:
-                    logger.warning(f"Error parseando fecha/hora: {fecha_str} {hora_str} - {e}")
-                    return pd.NaT
-
-            df_sorted["_datetime_temp"] = df_sorted.apply(parse_datetime, axis=1)
+            # Columna temporal con el instante del movimiento: el parser ya la
+            # calcula (Movimiento); si no viene, se arma vectorizada de fecha y hora
+            if "Movimiento" in df.columns:
+                movimiento = df["Movimiento"]
+            else:
+                movimiento = movement_datetimes(df[fecha_col], df[hora_col] if hora_col else None)
+            df_sorted = df.assign(_datetime_temp=movimiento.to_numpy())
 
             # Log de fechas antes y después de ordenar para debug
             if not df_sorted["_datetime_temp"].isna().all():
@@ -132,7 +149,7 @@ class BankProcessor:
         Procesar múltiples archivos bancarios
         
         Args:
-            uploaded_files: Lista de archivos subidos
+            uploaded_files: Lista de archivos subidos (o rutas ``pathlib.Path`` en disco)
             sheet_id: ID de la hoja de Google Sheets
             sheet_tab: Nombre de la pestaña
             demo_mode: Si está en modo demo
@@ -157,93 +174,157 @@ class BankProcessor:
                 logger.warning(f"No se pudo conectar a Google Sheets: {e}")
                 sheets_service = None
         
-        # Procesar cada archivo
-        for file_idx, uploaded_file in enumerate(uploaded_files):
-            logger.info(f"Procesando archivo {file_idx + 1}/{len(uploaded_files)}: {uploaded_file.name}")
+        # Expandir .zip/.gz y archivos con varias cuentas en sus estados de cuenta;
+        # lo que se abra (mmap, miembros, secciones) se cierra al terminar
+        with ExitStack() as opened:
+            files = []
+            for uploaded_file in uploaded_files:
+                try:
+                    files.extend(opened.enter_context(self.reader.open_members(uploaded_file)))
+                except (zipfile.BadZipFile, ValueError, OSError) as e:
+                    logger.error(f"Error abriendo {getattr(uploaded_file, 'name', uploaded_file)}: {e}")
+        
+            # Recibo+Descripción existentes: una sola descarga de la hoja para
+            # todos los archivos (el cliente de Sheets no se usa desde los hilos)
+            existing_recibo_desc = None
+            if files and sheets_service and not demo_mode:
+                existing_recibo_desc = self._get_existing_recibo_desc(sheets_service)
+
+            # Solo la lectura y el parseo son concurrentes; la validación contra
+            # Sheets se hace después, en orden (el orden de resultados se conserva)
+            workers = min(self.max_workers, len(files)) or 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._load_parsed, uploaded_file) for uploaded_file in files]
             
-            try:
-                result = self._process_single_file(
-                    uploaded_file, 
-                    sheets_service, 
-                    existing_analysis,
-                    demo_mode
-                )
-                
-                if result:
-                    all_results.append(result)
-                    logger.info(f"Archivo {uploaded_file.name} procesado exitosamente")
+                for file_idx, (uploaded_file, future) in enumerate(zip(files, futures)):
+                    logger.info(f"Procesando archivo {file_idx + 1}/{len(files)}: {uploaded_file.name}")
                 
-            except Exception as e:
-                logger.error(f"Error procesando {uploaded_file.name}: {e}")
-                continue
+                    try:
+                        loaded = future.result()
+                        if loaded is None:
+                            continue
+                        file_hash, parsed = loaded
+                        result = self._process_single_file(
+                            uploaded_file,
+                            file_hash,
+                            parsed,
+                            existing_analysis,
+                            existing_recibo_desc,
+                        )
+                    
+                        if result:
+                            all_results.append(result)
+                            logger.info(f"Archivo {uploaded_file.name} procesado exitosamente")
+                    
+                    except Exception as e:
+                        logger.error(f"Error procesando {uploaded_file.name}: {e}")
+                        continue
         
         logger.info(f"Procesamiento completado: {len(all_results)} archivos exitosos")
         return all_results
     
-    def _process_single_file(
-        self, 
-        uploaded_file, 
-        sheets_service: Optional[GoogleSheetsService],
-        existing_analysis: Dict[str, Any],
-        demo_mode: bool
-    ) -> Optional[Dict[str, Any]]:
+    def _load_parsed(self, uploaded_file) -> Optional[Tuple[str, ParsedFile]]:
         """
-        Procesar un archivo individual
-        
+        Leer y parsear un archivo (o tomarlo del cache de parseo)
+
+        Es la parte concurrente de ``process_files``: no usa Google Sheets.
+
         Args:
             uploaded_file: Archivo a procesar
-            sheets_service: Servicio de Google Sheets
-            existing_analysis: Análisis de datos existentes
-            demo_mode: Si está en modo demo
-            
+
         Returns:
-            Resultado del procesamiento o None si hay error
+            Tupla (hash del archivo, ParsedFile) o None si no tiene datos válidos
         """
         # Generar hash del archivo para registro (NO para validación)
-        file_hash = hashlib.md5(uploaded_file.read()).hexdigest()
-        uploaded_file.seek(0)
+        file_hash = self._file_hash(uploaded_file)
 
         # NOTA: NO validamos hash de archivo - solo Recibo+Descripción
         # Esto permite cargar el mismo archivo con datos actualizados
         logger.info(f"Procesando archivo {uploaded_file.name} (hash: {file_hash[:8]}...)")
+
+        # Archivo ya analizado (mismo contenido y versión del parser): se
+        # omiten lectura, parseo y clasificación; solo se vuelve a formatear
+        parsed = self.parse_cache.load(file_hash) if self.parse_cache is not None else None
+        if parsed is not None:
+            logger.info(f"Archivo {uploaded_file.name} cargado del cache de parseo")
+            parsed.formatted = self._format_by_chunks(parsed.raw_data)
+        else:
+            parsed = self._read_and_parse(uploaded_file)
+            if parsed is None:
+                return None
+            if self.parse_cache is not None:
+                self.parse_cache.store(file_hash, parsed)
+        return file_hash, parsed
+
+    def _format_by_chunks(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Formatear una tabla ya parseada en bloques de ``chunk_size`` filas
+
+        Args:
+            df: Tabla parseada (p. ej. cargada del cache de parseo)
+
+        Returns:
+            Tabla formateada, igual a la que arma _read_and_parse
+        """
+        step = self.reader.chunk_size
+        formatted_chunks = [
+            self.formatter.format_for_sheets(df.iloc[start:start + step], offset=start)
+            for start in range(0, len(df), step)
+        ]
+        if not formatted_chunks:
+            return self.formatter.format_for_sheets(df)
+        return pd.concat(formatted_chunks, ignore_index=True) if len(formatted_chunks) > 1 else formatted_chunks[0]
+
+    def _process_single_file(
+        self,
+        uploaded_file,
+        file_hash: str,
+        parsed: ParsedFile,
+        existing_analysis: Dict[str, Any],
+        existing_recibo_desc: Optional[Set[str]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Validar un archivo ya parseado contra los datos existentes
         
-        # PASO 1: Lectura del archivo
-        logger.info(f"Leyendo archivo: {uploaded_file.name}")
-        df_raw = self.reader.read_file(uploaded_file)
-        
-        if df_raw.empty:
-            logger.warning(f"Archivo {uploaded_file.name} está vacío")
-            return None
-        
-        # PASO 2: Parseo y análisis
-        logger.info(f"Parseando datos de: {uploaded_file.name}")
-        df = self.parser.parse_data(df_raw)
-        
-        if df.empty:
-            logger.warning(f"No se encontraron datos válidos en {uploaded_file.name}")
-            return None
-        
-        # PASO 3: Clasificación de tipos
-        logger.info(f"Clasificando tipos de transacciones en: {uploaded_file.name}")
-        df['Tipo'] = df['Descripción'].map(self.parser.classify_transaction_type)
-        
-        # PASO 4: Generación de UIDs
-        logger.info(f"Generando UIDs únicos para: {uploaded_file.name}")
-        df = self.parser.add_unique_ids(df)
+        Args:
+            uploaded_file: Archivo procesado
+            file_hash: MD5 del archivo
+            parsed: Resultado de ``_load_parsed``
+            existing_analysis: Análisis de datos existentes
+            existing_recibo_desc: Combinaciones Recibo+Descripción de Sheets
+                (None sin Google Sheets o en modo demo)
+            
+        Returns:
+            Resultado del procesamiento o None si hay error
+        """
+        df = parsed.raw_data
+        df_formatted = parsed.formatted
+        encoding = parsed.encoding
+        metadata = parsed.metadata
+        quarantine = parsed.quarantine
+        timings = parsed.timings
+
+        # Montos que no se pudieron convertir: se insertan en 0 pero se reportan
+        invalid_amounts = df[df["MontoInvalido"]] if "MontoInvalido" in df.columns else df.iloc[0:0]
+        if not invalid_amounts.empty:
+            logger.warning(f"{len(invalid_amounts)} filas con montos inválidos en {uploaded_file.name}")
+
+        # Continuidad del saldo: una fila faltante o duplicada rompe Saldo = anterior + Abono - Cargo
+        balance_check = check_balance_continuity(df, max_gaps=MAX_BALANCE_GAPS)
+        if not balance_check.ok:
+            logger.warning(
+                f"{balance_check.gap_count} saltos de saldo (orden {balance_check.order}) en {uploaded_file.name}"
+            )
         
-        # PASO 5: Formatear PRIMERO para tener Recibo correcto
-        logger.info(f"Formateando datos de: {uploaded_file.name}")
-        df_formatted = self.formatter.format_for_sheets(df)
-
         # PASO 6: Validar duplicados por Recibo+Descripción en Google Sheets
         logger.info(f"Validando duplicados por Recibo+Descripción en: {uploaded_file.name}")
         duplicates_info = []
         nuevos_indices = []
 
-        if sheets_service and not demo_mode:
+        if existing_recibo_desc is not None:
             try:
-                # Obtener datos existentes de Google Sheets para validar
-                existing_recibo_desc = self._get_existing_recibo_desc(sheets_service)
+                # Copia por archivo: los agregados solo evitan duplicados dentro del mismo archivo
+                existing_recibo_desc = set(existing_recibo_desc)
                 logger.info(f"📊 Validando contra {len(existing_recibo_desc)} combinaciones Recibo+Descripción en Sheets")
 
                 # Validar cada registro formateado
@@ -285,9 +366,15 @@ class BankProcessor:
         stats = {
             "Archivo": uploaded_file.name,
             "HashArchivo": file_hash,
+            "Codificación": encoding,
+            "Cuenta": metadata.account if metadata else None,
+            "Periodo": metadata.period if metadata else None,
             "FilasLeídas": len(df),
             "NuevosInsertados": len(nuevos),
             "DuplicadosSaltados": len(duplicates_info),
+            "LíneasEnCuarentena": len(quarantine),
+            "MontosInválidos": len(invalid_amounts),
+            "SaltosDeSaldo": balance_check.gap_count,
             "Conflictivos": 0,
             "FechaHora": datetime.now().isoformat(timespec="seconds"),
         }
@@ -295,17 +382,145 @@ class BankProcessor:
         result = {
             "file_name": uploaded_file.name,
             "file_hash": file_hash,
+            "encoding": encoding,
+            "metadata": metadata,
             "raw_data": df,
             "new_data": nuevos,
             "duplicates": duplicates_info,  # Lista de duplicados con info completa
+            "quarantine": quarantine,  # Líneas mal formadas
+            "invalid_amounts": invalid_amounts,  # Filas con montos no convertibles (en 0)
+            "balance_check": balance_check.to_dict(),  # Filas donde el saldo corrido no cuadra
+            "timings": timings,  # Segundos por etapa de parseo (normalización, Tipo, ClaveRastreo, UID)
+            "from_cache": parsed.from_cache,  # Resultado tomado del cache de parseo
             "analysis": analysis,
             "validation": validation,
             "stats": stats,
+            "tail_checkpoint": parsed.tail_checkpoint,
         }
         
         logger.info(f"Archivo {uploaded_file.name} procesado: {len(nuevos)} registros nuevos, {len(duplicates_info)} duplicados")
         return result
 
+    def _read_and_parse(self, uploaded_file) -> Optional[ParsedFile]:
+        """
+        Leer, parsear, clasificar y formatear un archivo
+
+        Args:
+            uploaded_file: Archivo a procesar
+
+        Returns:
+            ParsedFile o None si el archivo no tiene datos válidos
+        """
+        # Codificación y metadata (cuenta, periodo, saldos) con el primer bloque
+        descriptor = self.reader.detect_format(uploaded_file)
+        encoding = descriptor.encoding
+        metadata = descriptor.metadata
+        logger.info(f"Codificación detectada en {uploaded_file.name}: {encoding}")
+        if metadata is not None:
+            logger.info(f"Cuenta {metadata.account or 'N/D'}, periodo {metadata.period or 'N/D'}: {uploaded_file.name}")
+        
+        # PASO 1-5: Lectura por bloques, parseo, clasificación, UIDs y formato.
+        # Cada bloque leído se parsea y formatea antes de leer el siguiente;
+        # lo que se conserva son las tablas parseada y formateada del archivo
+        # (el resultado), así que la memoria sigue creciendo con el archivo:
+        # el límite por bloque aplica a la lectura y las etapas intermedias
+        logger.info(f"Leyendo archivo por bloques: {uploaded_file.name}")
+        parsed_chunks = []
+        formatted_chunks = []
+        rows_parsed = 0
+        rows_read = 0
+        # Líneas mal formadas: se saltan y se reportan para corregir solo esas
+        quarantine: List[BadLine] = []
+        # Segundos acumulados por etapa de parseo y enriquecimiento
+        timings = dict.fromkeys(PIPELINE_STAGES, 0.0)
+
+        # En modo seguimiento solo se leen las filas agregadas desde la última ingesta
+        chunks, tail_checkpoint = self.reader.read_new_chunks(uploaded_file, quarantine=quarantine)
+
+        for chunk_idx, df_raw in enumerate(chunks):
+            rows_read += len(df_raw)
+            logger.info(f"Parseando bloque {chunk_idx + 1} ({len(df_raw)} filas) de: {uploaded_file.name}")
+            # Normalización, Tipo, ClaveRastreo y UID en una sola pasada
+            df_chunk, chunk_timings = self.parser.parse_and_enrich(df_raw)
+            for stage, seconds in chunk_timings.items():
+                timings[stage] += seconds
+
+            if df_chunk.empty:
+                continue
+
+            parsed_chunks.append(df_chunk)
+            # PASO 5: Formatear el bloque (las columnas secuenciales siguen la posición en el archivo)
+            formatted_chunks.append(self.formatter.format_for_sheets(df_chunk, offset=rows_parsed))
+            rows_parsed += len(df_chunk)
+
+        # El checkpoint no debe dejar atrás filas en cuarentena
+        tail_checkpoint = self.reader.limit_tail(uploaded_file, tail_checkpoint, quarantine)
+
+        if rows_read == 0:
+            if self.reader.tail_store is not None:
+                logger.info(f"Archivo {uploaded_file.name} sin movimientos nuevos")
+            else:
+                logger.warning(f"Archivo {uploaded_file.name} está vacío")
+            return None
+
+        if not parsed_chunks:
+            logger.warning(f"No se encontraron datos válidos en {uploaded_file.name}")
+            return None
+
+        df = pd.concat(parsed_chunks) if len(parsed_chunks) > 1 else parsed_chunks[0]
+        df_formatted = pd.concat(formatted_chunks, ignore_index=True) if len(formatted_chunks) > 1 else formatted_chunks[0]
+        logger.info(
+            f"Tiempos de parseo de {uploaded_file.name}: "
+            + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+        )
+
+        return ParsedFile(
+            raw_data=df,
+            formatted=df_formatted,
+            encoding=encoding,
+            metadata=metadata,
+            quarantine=[bad_line.to_dict() for bad_line in quarantine],
+            timings=timings,
+            tail_checkpoint=tail_checkpoint,
+        )
+
+    def commit_tail(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Registrar como ingeridas las filas de los resultados (modo seguimiento)
+
+        Debe llamarse después de insertar los datos: la siguiente exportación
+        de cada cuenta solo leerá las filas posteriores.
+
+        Args:
+            results: Resultados de ``process_files`` ya insertados
+        """
+        for result in results:
+            self.reader.commit_tail(result.get("tail_checkpoint"))
+
+    def _file_hash(self, uploaded_file) -> str:
+        """
+        Calcular el MD5 del archivo sin copiar su contenido
+
+        Usa la vista del buffer (``getbuffer``) cuando el archivo es un BytesIO,
+        como los uploaded_file de Streamlit; en otro caso lee por bloques.
+
+        Args:
+            uploaded_file: Archivo a procesar
+
+        Returns:
+            Hash MD5 como string hexadecimal
+        """
+        if hasattr(uploaded_file, "getbuffer"):
+            with uploaded_file.getbuffer() as view:
+                return hashlib.md5(view).hexdigest()
+
+        # Miembros de .zip/.gz: leer por bloques para no descomprimir todo en memoria
+        md5 = hashlib.md5()
+        for block in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+            md5.update(block)
+        uploaded_file.seek(0)
+        return md5.hexdigest()
+
     def _get_existing_recibo_desc(self, sheets_service: GoogleSheetsService) -> set:
         """
         Obtener combinaciones existentes de Recibo+Descripción desde Google Sheets
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Cuarentena de líneas mal formadas
+
+Una fila con una coma de más en la descripción o un último registro
+cortado no detienen la lectura: el parser C de pandas salta las filas con
+campos de más (``on_bad_lines="warn"``; el motor C no admite callbacks) y el
+registro cortado se deja fuera antes de leer. Aquí se recuperan su número
+de línea y su texto para que el operador corrija solo esas líneas.
+
+Los avisos del parser C se reparten por hilo: cada lectura registra su
+propia lista y el aviso va a la lista del hilo que está parseando, sin
+``warnings.catch_warnings`` (estado global) ni candados, así que varias
+lecturas pueden parsear en paralelo.
+"""
+
+import io
+import re
+import csv
+import threading
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.errors import ParserWarning
+
+from .parser import parse_amounts
+
+# Mensaje del parser C con on_bad_lines="warn"
+_SKIPPING_LINE = re.compile(r"Skipping line (\d+): ([^\n]*)")
+
+# Lista de líneas saltadas de la lectura en curso, por hilo
+_collectors = threading.local()
+
+# Solo protege la instalación del desvío de avisos (no la lectura)
+_INSTALL_LOCK = threading.Lock()
+
+_SCAN_BLOCK_SIZE = 1024 * 1024
+_TAIL_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class BadLine:
+    """Línea del archivo que no se pudo leer"""
+
+    line_number: Optional[int]  # Número de línea en el archivo (1-based; None si no se ubicó)
+    text: str
+    reason: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _BadLineRouter:
+    """
+    ``warnings.showwarning`` que entrega "Skipping line N" a la lectura del hilo
+
+    Los demás avisos (y los de hilos sin lectura en curso) siguen al
+    ``showwarning`` que había antes.
+    """
+
+    def __init__(self, previous):
+        self.previous = previous
+
+    def __call__(self, message, category, filename, lineno, file=None, line=None):
+        found = getattr(_collectors, "found", None)
+        if found is not None and issubclass(category, ParserWarning):
+            matches = _SKIPPING_LINE.findall(str(message))
+            if matches:
+                found.extend((int(number), reason) for number, reason in matches)
+                return
+        self.previous(message, category, filename, lineno, file, line)
+
+
+def _install_router() -> None:
+    """Instalar el desvío (una vez, o de nuevo si otro código lo reemplazó)"""
+    if isinstance(warnings.showwarning, _BadLineRouter):
+        return
+    with _INSTALL_LOCK:
+        if not isinstance(warnings.showwarning, _BadLineRouter):
+            # "always": el mismo número de línea en otro archivo también se reporta
+            warnings.filterwarnings("always", message="Skipping line", category=ParserWarning)
+            warnings.showwarning = _BadLineRouter(warnings.showwarning)
+
+
+@contextmanager
+def capture_bad_lines(found: List[Tuple[int, str]]):
+    """
+    Capturar las líneas saltadas por el parser C (``on_bad_lines="warn"``)
+
+    Agrega a ``found`` tuplas (línea relativa al inicio de la lectura,
+    motivo) de los avisos emitidos en este hilo dentro del bloque.
+    """
+    _install_router()
+    previous = getattr(_collectors, "found", None)
+    _collectors.found = found
+    try:
+        yield
+    finally:
+        _collectors.found = previous
+
+
+def _iter_lines(buffer, start_offset: int) -> Iterable[Tuple[int, bytes]]:
+    """Recorrer las líneas desde ``start_offset`` por bloques: (número, bytes)"""
+    buffer.seek(start_offset)
+    number = 0
+    carry = b""
+    while True:
+        block = buffer.read(_SCAN_BLOCK_SIZE)
+        if not block:
+            break
+        lines = (carry + block).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            number += 1
+            yield number, line
+    if carry:
+        yield number + 1, carry
+
+
+def fetch_lines(buffer, start_offset: int, numbers: Iterable[int]) -> Dict[int, bytes]:
+    """
+    Obtener el texto de las líneas indicadas (relativas a ``start_offset``)
+
+    Un solo recorrido por bloques que termina en la última línea buscada.
+    """
+    wanted = set(numbers)
+    last = max(wanted, default=0)
+    found = {}
+    for number, line in _iter_lines(buffer, start_offset):
+        if number in wanted:
+            found[number] = line.rstrip(b"\r")
+        if number >= last:
+            break
+    return found
+
+
+def locate_lines(buffer, start_offset: int, texts: Sequence[str], encoding: str) -> List[Optional[int]]:
+    """
+    Número de línea (relativo a ``start_offset``) de cada texto de fila
+
+    ``texts`` va en el orden del archivo: cada línea que coincide se asigna
+    a la siguiente ocurrencia pendiente de su texto, así que una fila
+    repetida recibe el número de cada una de sus apariciones.
+
+    Returns:
+        Un número por texto, o None si el texto no aparece como línea
+        (por ejemplo, una fila con un campo de varias líneas)
+    """
+    pending: Dict[bytes, Deque[int]] = {}
+    for position, text in enumerate(texts):
+        pending.setdefault(text.encode(encoding, errors="replace"), deque()).append(position)
+    located: List[Optional[int]] = [None] * len(texts)
+    remaining = len(texts)
+    for number, line in _iter_lines(buffer, start_offset):
+        if not remaining:
+            break
+        positions = pending.get(line.rstrip(b"\r"))
+        if positions:
+            located[positions.popleft()] = number
+            remaining -= 1
+    return located
+
+
+def line_offset(buffer, line_number: int) -> Optional[int]:
+    """
+    Byte donde empieza la línea ``line_number`` (1-based) del archivo
+
+    Returns:
+        Offset o None si el archivo tiene menos líneas
+    """
+    if line_number <= 1:
+        return 0
+    buffer.seek(0)
+    pos = 0
+    remaining = line_number - 1
+    while True:
+        block = buffer.read(_SCAN_BLOCK_SIZE)
+        if not block:
+            return None
+        count = block.count(b"\n")
+        if count >= remaining:
+            idx = -1
+            for _ in range(remaining):
+                idx = block.index(b"\n", idx + 1)
+            return pos + idx + 1
+        remaining -= count
+        pos += len(block)
+
+
+def count_lines(buffer, end: int) -> int:
+    """Número de saltos de línea antes del byte ``end``"""
+    buffer.seek(0)
+    count = 0
+    remaining = end
+    while remaining > 0:
+        block = buffer.read(min(_SCAN_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        count += block.count(b"\n")
+        remaining -= len(block)
+    return count
+
+
+def _last_record(body: bytes, tail_is_file: bool, quotechar: str) -> Optional[Tuple[int, bool]]:
+    """
+    Inicio (dentro de ``body``) del último registro CSV y si cierra sus comillas
+
+    Un registro con un campo entre comillas puede ocupar varias líneas, así
+    que no basta con el texto después del último salto. Un salto separa
+    registros solo si queda fuera de comillas (número par de comillas
+    antes de él, contando desde un inicio de registro); el último registro
+    empieza en el inicio de línea más temprano tras el cual ningún salto
+    separa registros. Un recorrido hacia atrás, lineal en el bloque.
+
+    Returns:
+        Tupla (inicio, comillas cerradas) o None si el bloque no alcanza a
+        contener el inicio del registro
+    """
+    quote = quotechar.encode("latin-1")
+    newlines = [m.start() for m in re.finditer(b"\n", body)]
+    # Comillas acumuladas (paridad) hasta cada salto
+    parities = []
+    count = 0
+    prev = 0
+    for pos in newlines:
+        count += body.count(quote, prev, pos)
+        parities.append(count % 2)
+        prev = pos
+    total = (count + body.count(quote, prev)) % 2
+
+    candidates = [(pos + 1, parity) for pos, parity in zip(newlines, parities)]
+    if tail_is_file:
+        candidates.insert(0, (0, 0))
+
+    found = None
+    later = set()           # Paridades de los saltos posteriores al candidato
+    for (start, parity), next_newline in zip(reversed(candidates), reversed(parities + [None])):
+        if next_newline is not None:
+            later.add(next_newline)
+        if parity in later:
+            # Algún salto posterior queda fuera de comillas desde este inicio
+            if len(later) == 2:
+                break
+            continue
+        found = (start, total == parity)
+    return found
+
+
+def _amounts_parse(fields: List[str], amount_positions: Sequence[int]) -> bool:
+    """Si el registro llega hasta los montos y cada monto presente es un número"""
+    if not amount_positions:
+        return True
+    if len(fields) <= max(amount_positions):
+        return False
+    values = pd.Series([fields[i] for i in amount_positions], dtype=object)
+    _, invalid = parse_amounts(values)
+    return not invalid.any()
+
+
+def truncated_last_line(
+    buffer,
+    delimiter: str,
+    quotechar: str = '"',
+    amount_positions: Sequence[int] = (),
+) -> Optional[Tuple[int, bytes]]:
+    """
+    Último registro del archivo si quedó cortado
+
+    Se revisa el registro completo (con sus campos entre comillas de varias
+    líneas), no solo la última línea física. Está cortado si:
+
+    - tiene una comilla sin cerrar al final del archivo (el parser C falla
+      con "EOF inside string"), o
+    - no termina en salto de línea y no llega a las columnas de montos o
+      alguno de sus montos no es un número.
+
+    Un registro completo al que le faltan campos finales opcionales (después
+    de los montos, o en formatos sin montos declarados) no está cortado.
+
+    Args:
+        buffer: Buffer binario del archivo
+        delimiter: Delimitador de columnas
+        quotechar: Carácter de comillas
+        amount_positions: Posiciones de las columnas de montos (Cargo, Abono, Saldo)
+
+    Returns:
+        Tupla (byte de inicio, bytes del registro) o None
+    """
+    size = buffer.seek(0, io.SEEK_END)
+    if size == 0:
+        return None
+    tail_start = max(0, size - _TAIL_SIZE)
+    buffer.seek(tail_start)
+    tail = buffer.read()
+    terminated = tail.endswith(b"\n")
+    body = tail.rstrip(b"\r\n")
+    last = _last_record(body, tail_start == 0, quotechar)
+    if last is None or not body[last[0]:].strip():
+        return None
+
+    start, closed = last
+    if closed:
+        if terminated:
+            return None
+        record = body[start:].decode("latin-1")
+        fields = next(csv.reader(io.StringIO(record, newline=""), delimiter=delimiter, quotechar=quotechar), [])
+        if _amounts_parse(fields, amount_positions):
+            return None
+    return tail_start + start, tail[start:]
+
+
+class BoundedReader(io.RawIOBase):
+    """
+    Vista de solo lectura de un buffer que termina en el byte ``end``
+
+    Las posiciones son las del buffer original; se usa para leer sin la
+    última línea cortada.
+    """
+
+    def __init__(self, raw, end: int):
+        self._raw = raw
+        self._end = end
+        self.name = getattr(raw, "name", None)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), self._end - self._raw.tell()))
+        data = self._raw.read(n) if n else b""
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            offset, whence = offset + self._end, io.SEEK_SET
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+
+def without_truncated_line(buffer, truncated: Optional[Tuple[int, bytes]]):
+    """Buffer a leer: el original, o acotado antes del registro cortado"""
+    return buffer if truncated is None else BoundedReader(buffer, truncated[0])
+
+
+def resolve_bad_lines(
+    buffer,
+    start_offset: int,
+    line_base: int,
+    skipped: List[Tuple[int, str]],
+    encoding: str,
+) -> List[BadLine]:
+    """
+    Convertir líneas saltadas (números relativos) en BadLine con su texto
+
+    Args:
+        buffer: Buffer binario del archivo
+        start_offset: Byte donde empezó la lectura
+        line_base: Líneas del archivo antes de ``start_offset``
+        skipped: Tuplas (línea relativa, motivo) del parser
+        encoding: Codificación del archivo
+
+    Returns:
+        Lista de BadLine con número de línea absoluto
+    """
+    if not skipped:
+        return []
+    texts = fetch_lines(buffer, start_offset, (number for number, _ in skipped))
+    return [
+        BadLine(
+            line_number=line_base + number,
+            text=texts.get(number, b"").decode(encoding, errors="replace"),
+            reason=reason,
+        )
+        for number, reason in skipped
+    ]
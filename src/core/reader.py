@@ -1,22 +1,290 @@
 #!/usr/bin/env python3
 """
-Lector especializado para archivos de BanBajío
+Lector especializado para archivos de BanBajío y otros bancos registrados
 """
 
+import numpy as np
 import pandas as pd
 import io
+import os
+import re
+import csv
+import mmap
+import logging
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .archives import is_archive, open_archive_members
+from .encoding import ENCODING_ERRORS, probe_encoding, utf8_stream
+from .arrow_reader import PYARROW_AVAILABLE, iter_banbajio_arrow_batches, read_banbajio_arrow
+from .bank_formats import get_bank_format, match_bank_format, max_header_row
+from .metadata import StatementMetadata, parse_metadata_line
+from .quarantine import (
+    BadLine,
+    capture_bad_lines,
+    count_lines,
+    line_offset,
+    locate_lines,
+    resolve_bad_lines,
+    truncated_last_line,
+    without_truncated_line,
+)
+from .schemas import ReadSchema
+from .sections import find_statement_sections
+from .tail import TailCheckpoint, TailStateStore, account_key
+
+logger = logging.getLogger(__name__)
+
+# Filas por bloque cuando se lee en modo streaming
+DEFAULT_CHUNK_SIZE = 50000
+
+# Bytes que se leen por vez al cortar el archivo en bloques de líneas
+LINE_BLOCK_READ_SIZE = 1024 * 1024
+
+# Backends de lectura disponibles (READER_BACKEND en settings)
+READER_BACKENDS = ("pandas", "pyarrow")
+
+# Bytes que se inspeccionan para detectar el formato (se amplía si el
+# encabezado no cabe completo, hasta DETECT_MAX_SAMPLE_SIZE)
+DETECT_SAMPLE_SIZE = 8 * 1024
+DETECT_MAX_SAMPLE_SIZE = 64 * 1024
+
+BANBAJIO_HEADER = '#,Fecha Movimiento,Hora,Recibo,Descripción'
+
+# Montos con separadores: 1.234,56 (decimal coma) y 1,234.56 (miles coma)
+_AMOUNT_DECIMAL_COMMA = re.compile(r'^-?\$?\d{1,3}(?:\.\d{3})*,\d{1,2}$')
+_AMOUNT_THOUSANDS_COMMA = re.compile(r'^-?\$?\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?$')
+
+# Dialectos ya detectados, indexados por la línea de encabezados
+_DIALECT_CACHE: Dict[str, "CsvDialect"] = {}
+_DIALECT_CACHE_MAX_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    """Dialecto CSV detectado a partir de una muestra"""
+
+    delimiter: str = ','
+    quotechar: str = '"'
+    decimal: str = '.'
+    thousands: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FormatDescriptor:
+    """Formato detectado a partir de una muestra del archivo"""
+
+    bank: str                   # Banco registrado ("banbajio", "bbva"...) o "generic"
+    header_row: int             # Índice (0-based) de la línea de encabezados
+    header_offset: int          # Byte donde inicia la línea de encabezados
+    delimiter: str
+    encoding: str
+    columns: Tuple[str, ...]
+    quotechar: str = '"'
+    decimal: str = '.'
+    thousands: Optional[str] = None
+    metadata: Optional[StatementMetadata] = None    # Línea previa al encabezado
+
+    @property
+    def is_banbajio(self) -> bool:
+        return self.bank == "banbajio"
+
+    @property
+    def is_registered(self) -> bool:
+        """El formato tiene plugin en el registro (lectura rápida con esquema)"""
+        return self.bank != "generic"
+
+
+def _read_sample(source, size: int) -> bytes:
+    """
+    Obtener los primeros ``size`` bytes de un buffer o contenido sin consumirlo
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:size])
+    if isinstance(source, str):
+        return source[:size].encode('utf-8')
+
+    start = source.tell()
+    sample = source.read(size)
+    source.seek(start)
+    if isinstance(sample, str):
+        sample = sample.encode('utf-8')
+    return sample
+
+
+def _split_sample_lines(sample: bytes, count: int) -> list:
+    """
+    Separar las primeras ``count`` líneas completas de la muestra
+
+    Returns:
+        Lista de tuplas (offset_en_bytes, línea_en_bytes) sin salto de línea
+    """
+    lines: List[Tuple[int, bytes]] = []
+    offset = 0
+    while len(lines) < count:
+        end = sample.find(b'\n', offset)
+        if end == -1:
+            break
+        lines.append((offset, sample[offset:end].rstrip(b'\r')))
+        offset = end + 1
+    return lines
+
+
+def sniff_dialect(sample_text: str, header: str) -> CsvDialect:
+    """
+    Detectar delimitador, comillas y separadores numéricos de una muestra
+
+    El resultado se guarda en caché por firma de encabezado: los archivos con
+    el mismo encabezado (exportaciones del mismo sistema) reutilizan el
+    dialecto sin volver a inspeccionar la muestra.
+
+    Args:
+        sample_text: Líneas completas iniciales del archivo
+        header: Línea de encabezados (firma para la caché)
+
+    Returns:
+        CsvDialect con delimiter, quotechar, decimal y thousands
+    """
+    cached = _DIALECT_CACHE.get(header)
+    if cached is not None:
+        return cached
+
+    try:
+        sniffed = csv.Sniffer().sniff(sample_text, delimiters=',;\t|')
+        delimiter, quotechar = sniffed.delimiter, sniffed.quotechar or '"'
+    except csv.Error:
+        delimiter, quotechar = ',', '"'
+
+    # Votar el formato numérico con los campos de la muestra
+    decimal_comma = thousands_comma = thousands_dot = 0
+    rows = csv.reader(io.StringIO(sample_text), delimiter=delimiter, quotechar=quotechar)
+    next(rows, None)  # Encabezados
+    for row in rows:
+        for field in row:
+            value = field.strip()
+            if _AMOUNT_DECIMAL_COMMA.match(value):
+                decimal_comma += 1
+                thousands_dot += '.' in value
+            elif _AMOUNT_THOUSANDS_COMMA.match(value):
+                thousands_comma += 1
+
+    if decimal_comma > thousands_comma:
+        dialect = CsvDialect(delimiter, quotechar, ',', '.' if thousands_dot else None)
+    elif thousands_comma:
+        dialect = CsvDialect(delimiter, quotechar, '.', ',')
+    else:
+        dialect = CsvDialect(delimiter, quotechar)
+
+    if len(_DIALECT_CACHE) >= _DIALECT_CACHE_MAX_SIZE:
+        _DIALECT_CACHE.clear()
+    _DIALECT_CACHE[header] = dialect
+    return dialect
+
+
+def detect_format(source, sample_size: int = DETECT_SAMPLE_SIZE) -> FormatDescriptor:
+    """
+    Detectar el formato del archivo inspeccionando solo los primeros KB
+
+    Nunca decodifica el archivo completo: lee una muestra (ampliándola solo si
+    las primeras líneas no caben en ella) y deja el buffer en su posición. La
+    codificación (UTF-8, cp1252 o latin-1) se detecta con la misma muestra.
+
+    Args:
+        source: Buffer (uploaded_file de Streamlit), bytes o str
+        sample_size: Bytes iniciales a inspeccionar
+
+    Returns:
+        FormatDescriptor con banco, offset del encabezado, delimitador,
+        codificación, columnas y la metadata de la cuenta (si el formato la trae)
+    """
+    # Líneas necesarias para comparar la firma de todos los formatos registrados
+    needed = max(max_header_row() + 1, 2)
+    size = sample_size
+    while True:
+        sample = _read_sample(source, size)
+        lines = _split_sample_lines(sample, needed)
+        if len(lines) == needed or len(sample) < size or size >= DETECT_MAX_SAMPLE_SIZE:
+            break
+        size *= 2
+
+    encoding = probe_encoding(sample)
+    if not lines and sample:
+        # Archivo de una sola línea sin salto final
+        lines = [(0, sample.rstrip(b'\r\n'))]
+
+    def decode(raw: bytes) -> str:
+        return raw.decode(encoding, errors=ENCODING_ERRORS)
+
+    # Formatos registrados (BanBajío, BBVA, ...): firma en su línea de encabezados
+    bank_format = match_bank_format([decode(line) for _, line in lines])
+    if bank_format is not None:
+        header_offset, header = lines[bank_format.header_row]
+        columns = next(csv.reader([decode(header).lstrip('\ufeff')], delimiter=bank_format.delimiter))
+        metadata = None
+        if bank_format.header_row > 0:
+            # Metadata (empresa, cuenta, periodo, saldos) en la misma muestra
+            metadata = parse_metadata_line(
+                decode(lines[0][1]).lstrip('\ufeff'),
+                bank_format.bank,
+                bank_format.delimiter,
+            )
+        return FormatDescriptor(
+            bank=bank_format.bank,
+            header_row=bank_format.header_row,
+            header_offset=header_offset,
+            delimiter=bank_format.delimiter,
+            encoding=encoding,
+            columns=tuple(c.strip() for c in columns),
+            metadata=metadata,
+        )
+
+    # Formato genérico: encabezados en la primera línea
+    last_newline = sample.rfind(b'\n')
+    text = decode(sample[:last_newline] if last_newline != -1 else sample)
+    header = decode(lines[0][1]).lstrip('\ufeff') if lines else ''
+    dialect = sniff_dialect(text, header)
+
+    columns = next(csv.reader([header], delimiter=dialect.delimiter)) if header else []
+    return FormatDescriptor(
+        bank="generic",
+        header_row=0,
+        header_offset=0,
+        delimiter=dialect.delimiter,
+        encoding=encoding,
+        columns=tuple(c.strip() for c in columns),
+        quotechar=dialect.quotechar,
+        decimal=dialect.decimal,
+        thousands=dialect.thousands,
+    )
+
+
+def schema_for(descriptor: FormatDescriptor) -> ReadSchema:
+    """
+    Esquema de tipos por defecto para el formato detectado
+
+    Los formatos sin plugin registrado se leen con inferencia de pandas
+    (esquema vacío).
+    """
+    bank_format = get_bank_format(descriptor.bank)
+    if bank_format is not None:
+        return bank_format.schema
+    return ReadSchema()
+
 
 def is_banbajio_format(content: str) -> bool:
     """
     Detecta si el archivo es formato BanBajío
     """
-    lines = content.split('\n')
+    # Solo se necesitan las dos primeras líneas
+    lines = content.split('\n', 2)
     if len(lines) < 2:
         return False
     
     # Verificar que la segunda línea tenga el formato esperado de BanBajío
     second_line = lines[1].strip()
-    return second_line.startswith('#,Fecha Movimiento,Hora,Recibo,Descripción')
+    return second_line.startswith(BANBAJIO_HEADER)
 
 def read_banbajio_file(content: str) -> pd.DataFrame:
     """
@@ -43,43 +311,966 @@ def read_banbajio_file(content: str) -> pd.DataFrame:
     
     return df
 
-def read_smart_csv(uploaded_file_or_content):
+def _parser_prefix(source, descriptor: FormatDescriptor, start_offset: Optional[int] = None) -> bytes:
     """
-    Lee un archivo CSV de manera inteligente, detectando si es BanBajío o formato estándar
+    Encabezado y una fila vacía (UTF-8) que se anteponen a cada lectura del parser C
+
+    El parser C no revisa el número de campos de la primera fila de datos
+    de una lectura (la admite con un campo de más para usarlo de índice) ni
+    de las siguientes con el mismo número; en modo ``chunksize`` pasa lo
+    mismo al inicio de cada bloque, y esas filas se recortaban en silencio.
+    Con una fila vacía de relleno en esa posición toda fila real con campos
+    de más se salta y llega a cuarentena.
+
+    Deja ``source`` posicionado donde empiezan los datos.
     """
-    # Si es un uploaded_file de streamlit, leer el contenido
-    if hasattr(uploaded_file_or_content, 'read'):
-        content = uploaded_file_or_content.read()
-        if isinstance(content, bytes):
-            content = content.decode('utf-8')
-        uploaded_file_or_content.seek(0)  # Reset para otras operaciones
+    if start_offset is None:
+        source.seek(descriptor.header_offset)
+        header = source.readline().decode(descriptor.encoding, errors="replace").lstrip("\ufeff").rstrip("\r\n")
+    else:
+        # Filas agregadas: el encabezado ya se conoce por la detección
+        source.seek(start_offset)
+        line = io.StringIO()
+        csv.writer(line, delimiter=descriptor.delimiter, quotechar=descriptor.quotechar, lineterminator="").writerow(
+            descriptor.columns
+        )
+        header = line.getvalue()
+    empty_row = descriptor.delimiter * (len(descriptor.columns) - 1)
+    return f"{header}\n{empty_row}\n".encode("utf-8")
+
+
+def _drop_prefix_row(df: pd.DataFrame, first_row: int = 0) -> pd.DataFrame:
+    """Quitar la fila de relleno; el índice cuenta las filas desde ``first_row``"""
+    df = df.iloc[1:]
+    df.index = pd.RangeIndex(first_row, first_row + len(df))
+    return df
+
+
+def iter_line_blocks(stream, lines: int, quotechar: str = '"') -> Iterator[Tuple[bytes, int]]:
+    """
+    Cortar un stream binario en bloques de ``lines`` registros completos
+
+    Los cortes caen en saltos de línea fuera de comillas (paridad de las
+    comillas acumulada con numpy), así que un campo entre comillas con
+    saltos de línea nunca queda partido entre dos bloques.
+
+    Args:
+        stream: Buffer binario posicionado donde inicia la lectura
+        lines: Registros por bloque
+        quotechar: Carácter de comillas del CSV
+
+    Yields:
+        Tuplas (bytes del bloque, registros que contiene)
+    """
+    quote = ord(quotechar) if quotechar else None
+    parts: List[bytes] = []
+    pending = 0
+    in_quotes = 0
+    while True:
+        data = stream.read(LINE_BLOCK_READ_SIZE)
+        if not data:
+            break
+        data = bytes(data)
+        raw = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(raw == 10)
+        if quote is not None and quote in data:
+            inside = np.bitwise_xor.accumulate((raw == quote).view(np.uint8)) ^ in_quotes
+            ends = ends[inside[ends] == 0]
+            in_quotes = int(inside[-1])
+
+        start = 0
+        used = 0
+        while len(ends) - used >= lines - pending:
+            used += lines - pending
+            cut = int(ends[used - 1]) + 1
+            parts.append(data[start:cut])
+            yield b"".join(parts), lines
+            parts, pending, start = [], 0, cut
+        if start < len(data):
+            parts.append(data[start:])
+        pending += len(ends) - used
+
+    if parts:
+        block = b"".join(parts)
+        yield block, pending + (not block.endswith(b"\n"))
+
+
+def iter_banbajio_chunks(
+    buffer,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    descriptor: Optional[FormatDescriptor] = None,
+    schema: Optional[ReadSchema] = None,
+    start_offset: Optional[int] = None,
+    quarantine: Optional[List[BadLine]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo BanBajío (o de otro banco registrado) en bloques de tamaño
+    fijo directamente del buffer
+
+    La línea de metadata se salta sobre el mismo buffer y el resto se corta
+    en bloques de ``chunksize`` líneas que lee el parser C de pandas (con el
+    encabezado y la fila de relleno de ``_parser_prefix``); nunca se
+    materializa el archivo completo como texto, así que la memoria queda
+    acotada al tamaño del bloque. Las líneas mal formadas se saltan sin salir
+    del parser C y se reportan en ``quarantine``.
+
+    Args:
+        buffer: Buffer binario, bytes o memoryview (se lee desde el encabezado)
+        chunksize: Número de filas por bloque
+        descriptor: Formato ya detectado; si se omite se detecta aquí
+        schema: Tipos de columna; por defecto el esquema del formato
+        start_offset: Byte de inicio de una fila; si se indica solo se leen
+            las filas desde ahí (con las columnas del encabezado detectado)
+        quarantine: Lista donde se agregan las líneas mal formadas (BadLine)
+
+    Yields:
+        DataFrames con los datos de cada bloque, ya tipados
+    """
+    buffer = _as_binary_buffer(buffer)
+    if descriptor is None:
+        descriptor = detect_format(buffer)
+    if schema is None:
+        schema = schema_for(descriptor)
+
+    truncated = _truncated_last_line(buffer, descriptor)
+    source = without_truncated_line(buffer, truncated)
+    # Línea 1: metadata - se ignora saltando directo al encabezado
+    prefix = _parser_prefix(source, descriptor, start_offset)
+    stream, encoding = utf8_stream(source, descriptor.encoding)
+
+    skipped: List[Tuple[int, str]] = []
+    # Líneas (relativas al inicio de la lectura) antes del bloque; el encabezado es la 1
+    line_base = 1 if start_offset is None else 0
+    rows = 0
+    for block, records in iter_line_blocks(stream, chunksize, descriptor.quotechar):
+        found: List[Tuple[int, str]] = []
+        # La captura no abarca el yield: el consumidor puede leer otros archivos
+        with capture_bad_lines(found):
+            chunk = pd.read_csv(
+                io.BytesIO(prefix + block),
+                sep=descriptor.delimiter,
+                encoding=encoding,
+                encoding_errors=ENCODING_ERRORS,
+                dtype=schema.read_csv_dtypes(),
+                on_bad_lines="warn",
+            )
+        # En el bloque, la línea 1 es el encabezado y la 2 la fila de relleno
+        skipped.extend((line_base + number - 2, reason) for number, reason in found)
+        line_base += records
+
+        chunk = _drop_prefix_row(chunk, rows)
+        rows += len(chunk)
+        # Limpiar datos vacíos al final
+        chunk = chunk.dropna(how='all')
+        if not chunk.empty:
+            yield schema.apply(chunk)
+
+    bad_lines = _quarantine_lines(buffer, descriptor, skipped, truncated, start_offset)
+    if quarantine is not None:
+        quarantine.extend(bad_lines)
+
+
+def _quarantine_lines(
+    buffer,
+    descriptor: FormatDescriptor,
+    skipped: list,
+    truncated: Optional[Tuple[int, bytes]],
+    start_offset: Optional[int] = None,
+) -> List[BadLine]:
+    """
+    Armar la cuarentena de una lectura (solo recorre el archivo si hubo errores)
+    """
+    if not skipped and truncated is None:
+        return []
+
+    if start_offset is None:
+        start_offset, line_base = descriptor.header_offset, descriptor.header_row
     else:
+        line_base = count_lines(buffer, start_offset)
+    bad_lines = resolve_bad_lines(buffer, start_offset, line_base, skipped, descriptor.encoding)
+
+    if truncated is not None:
+        line_start, line = truncated
+        bad_lines.append(BadLine(
+            line_number=count_lines(buffer, line_start) + 1,
+            text=line.rstrip(b"\r\n").decode(descriptor.encoding, errors='replace'),
+            reason="registro truncado",
+        ))
+
+    name = getattr(buffer, 'name', 'archivo')
+    for bad_line in bad_lines:
+        logger.warning(f"{name}: línea {bad_line.line_number} en cuarentena ({bad_line.reason})")
+    return bad_lines
+
+class _PrefixedReader(io.RawIOBase):
+    """Buffer binario que entrega ``prefix`` y después el contenido de ``raw``"""
+
+    def __init__(self, prefix: bytes, raw):
+        self._prefix = memoryview(prefix)
+        self._raw = raw
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._pos < len(self._prefix):
+            n = min(len(b), len(self._prefix) - self._pos)
+            b[:n] = self._prefix[self._pos:self._pos + n]
+            self._pos += n
+            return n
+        data = self._raw.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+class _MemoryViewReader(io.RawIOBase):
+    """Lector binario de solo lectura sobre un memoryview, sin copiar el contenido"""
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class MappedFile(_MemoryViewReader):
+    """
+    Estado de cuenta en disco mapeado en memoria (``mmap``)
+
+    Expone la misma interfaz que un uploaded_file de Streamlit (``read``,
+    ``seek``, ``getbuffer`` y ``name``) pero sin cargar el archivo en bytes de
+    Python: detección, hash y parser leen directamente de la región mapeada,
+    que el sistema operativo comparte entre procesos a través del page cache.
+    """
+
+    def __init__(self, path):
+        self.name = os.fspath(path)
+        with open(self.name, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # mmap no admite archivos vacíos
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        super().__init__(self._mmap if self._mmap is not None else b'')
+
+    def getbuffer(self) -> memoryview:
+        """Vista de solo lectura sobre la región mapeada (sin copia)"""
+        return memoryview(self._mmap if self._mmap is not None else b'')
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Alguien conserva una vista de getbuffer(); el mapeo se libera con ella
+                logger.warning(f"{self.name}: mmap con vistas abiertas; se libera al soltarlas")
+
+
+class StatementSection(_MemoryViewReader):
+    """
+    Sección de un archivo con varios estados de cuenta concatenados
+
+    Se lee como un archivo independiente (metadata + encabezado + filas).
+    Cuando el origen expone ``getbuffer`` la sección es una vista sin copia.
+    """
+
+    def __init__(self, name: str, data):
+        super().__init__(data)
+        self.name = name
+
+    def getbuffer(self) -> memoryview:
+        return self._view[:]
+
+
+def is_path(source) -> bool:
+    """
+    Indica si el origen es una ruta a un archivo en disco
+
+    Solo los ``os.PathLike`` (``pathlib.Path``) cuentan como ruta: un ``str``
+    es contenido, aunque coincida con el nombre de un archivo existente.
+    """
+    return isinstance(source, os.PathLike)
+
+
+def open_source(source):
+    """
+    Abrir rutas en disco con ``mmap``; cualquier otro origen se devuelve tal cual
+
+    El MappedFile devuelto pertenece a quien llama, que debe cerrarlo.
+    """
+    return MappedFile(source) if is_path(source) else source
+
+
+def _as_binary_buffer(source):
+    """
+    Envolver el origen en un buffer binario sin duplicar los bytes
+
+    Los buffers (uploaded_file de Streamlit, BytesIO) se usan tal cual;
+    ``bytes`` se envuelve en BytesIO (que comparte el objeto en CPython) y
+    bytearray/memoryview se leen a través de una vista.
+    """
+    if hasattr(source, 'read'):
+        return source
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, (bytearray, memoryview)):
+        return _MemoryViewReader(source)
+    raise TypeError(f"Origen no soportado para lectura binaria: {type(source).__name__}")
+
+
+def read_csv_bytes(
+    source,
+    header_offset: int = 0,
+    encoding: str = 'utf-8',
+    sep: str = ',',
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """
+    Leer un CSV directamente desde bytes con el parser C de pandas
+
+    El buffer se entrega a pandas posicionado en el encabezado, de modo que
+    la decodificación ocurre dentro del parser y nunca existe una copia del
+    archivo como ``str``. Las codificaciones distintas de UTF-8 se
+    transcodifican por bloques y los bytes inválidos a mitad del archivo se
+    interpretan como cp1252 en lugar de abortar la lectura.
+
+    Args:
+        source: Buffer binario, bytes, bytearray o memoryview
+        header_offset: Byte donde inicia la línea de encabezados
+        encoding: Codificación del archivo
+        sep: Delimitador de columnas
+        **read_csv_kwargs: Parámetros adicionales para ``pd.read_csv``
+
+    Returns:
+        DataFrame con los datos leídos
+    """
+    buffer = _as_binary_buffer(source)
+    buffer.seek(header_offset)
+    stream, encoding = utf8_stream(buffer, encoding)
+    return pd.read_csv(
+        stream,
+        sep=sep,
+        encoding=encoding,
+        encoding_errors=ENCODING_ERRORS,
+        **read_csv_kwargs,
+    )
+
+
+def _utf8_stream_at_header(source, descriptor: FormatDescriptor, truncated: Optional[Tuple[int, bytes]] = None):
+    """
+    Buffer UTF-8 posicionado en la línea de encabezados del archivo (sin la
+    última línea si quedó cortada)
+    """
+    buffer = without_truncated_line(_as_binary_buffer(source), truncated)
+    buffer.seek(descriptor.header_offset)
+    return utf8_stream(buffer, descriptor.encoding)
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Validar el backend de lectura y degradar a pandas si pyarrow no está instalado
+    """
+    backend = (backend or "pandas").lower()
+    if backend not in READER_BACKENDS:
+        logger.warning(f"Backend de lectura desconocido '{backend}'; usando pandas")
+        return "pandas"
+    if backend == "pyarrow" and not PYARROW_AVAILABLE:
+        logger.warning("pyarrow no está instalado; usando backend pandas")
+        return "pandas"
+    return backend
+
+
+def read_smart_csv(
+    uploaded_file_or_content,
+    backend: str = "pandas",
+    schema: Optional[ReadSchema] = None,
+    quarantine: Optional[List[BadLine]] = None,
+):
+    """
+    Lee un archivo CSV de manera inteligente, detectando el banco registrado o formato estándar
+
+    Args:
+        uploaded_file_or_content: uploaded_file de Streamlit, bytes o str
+        backend: "pandas" o "pyarrow" (solo aplica a bancos registrados)
+        schema: Tipos de columna; por defecto el esquema del formato detectado
+            (no aplica a contenido ``str``, que conserva la inferencia de pandas)
+        quarantine: Lista donde se agregan las líneas mal formadas (BadLine)
+    """
+    # Contenido ya decodificado (compatibilidad)
+    if isinstance(uploaded_file_or_content, str):
         content = uploaded_file_or_content
+        if is_banbajio_format(content):
+            return read_banbajio_file(content)
+        return pd.read_csv(io.StringIO(content), sep=None, engine="python")
+
+    # Detectar el formato con una muestra y leer los bytes sin decodificarlos
+    descriptor = detect_format(uploaded_file_or_content)
+    if schema is None:
+        schema = schema_for(descriptor)
     
-    # Detectar si es formato BanBajío
-    if is_banbajio_format(content):
-        # Detectado formato BanBajío - usando lector especializado
-        return read_banbajio_file(content)
+    if descriptor.is_registered:
+        # Banco registrado (BanBajío, BBVA...) - lector rápido con su esquema
+        df = _read_bank_bytes(uploaded_file_or_content, descriptor, backend, schema, quarantine)
     else:
-        # Formato CSV estándar - usando pandas
-        return pd.read_csv(io.StringIO(content), sep=None, engine="python")
+        # Formato CSV estándar - dialecto ya detectado, parser C de pandas
+        df = _read_generic_bytes(uploaded_file_or_content, descriptor, schema, quarantine)
+
+    if hasattr(uploaded_file_or_content, 'seek'):
+        uploaded_file_or_content.seek(0)  # Reset para otras operaciones
+    return df
+
+
+def _read_bank_bytes(
+    source,
+    descriptor: FormatDescriptor,
+    backend: str,
+    schema: ReadSchema,
+    quarantine: Optional[List[BadLine]] = None,
+) -> pd.DataFrame:
+    """
+    Leer completo un archivo de un banco registrado con el backend indicado
+    """
+    if resolve_backend(backend) == "pyarrow":
+        try:
+            invalid_rows: List[Tuple[str, str]] = []
+            truncated = _truncated_last_line(source, descriptor)
+            stream, encoding = _utf8_stream_at_header(source, descriptor, truncated)
+            df = read_banbajio_arrow(
+                stream,
+                stream.tell(),
+                encoding=encoding,
+                delimiter=descriptor.delimiter,
+                schema=schema,
+                invalid_rows=invalid_rows,
+            )
+            _extend_quarantine(quarantine, _arrow_quarantine_lines(source, descriptor, invalid_rows, truncated))
+            return df
+        except ValueError as e:
+            logger.warning(f"pyarrow no pudo leer el archivo ({e}); usando pandas")
+
+    buffer = _as_binary_buffer(source)
+    truncated = _truncated_last_line(buffer, descriptor)
+    bounded = without_truncated_line(buffer, truncated)
+    prefix = _parser_prefix(bounded, descriptor)
+    stream, encoding = utf8_stream(bounded, descriptor.encoding)
+    found: List[Tuple[int, str]] = []
+    with capture_bad_lines(found):
+        df = pd.read_csv(
+            _PrefixedReader(prefix, stream),
+            sep=descriptor.delimiter,
+            encoding=encoding,
+            encoding_errors=ENCODING_ERRORS,
+            dtype=schema.read_csv_dtypes(),
+            on_bad_lines="warn",
+        )
+    # Sin la línea de la fila de relleno (la 2)
+    skipped = [(number - 1, reason) for number, reason in found]
+    _extend_quarantine(quarantine, _quarantine_lines(buffer, descriptor, skipped, truncated))
+    # Limpiar datos vacíos al final
+    return schema.apply(_drop_prefix_row(df).dropna(how='all'))
+
+
+def _read_generic_bytes(
+    source,
+    descriptor: FormatDescriptor,
+    schema: ReadSchema,
+    quarantine: Optional[List[BadLine]] = None,
+) -> pd.DataFrame:
+    """
+    Leer un CSV genérico con el dialecto detectado y el parser C de pandas
+    """
+    try:
+        df = _read_csv_quarantined(
+            source,
+            descriptor,
+            quarantine,
+            encoding=descriptor.encoding,
+            sep=descriptor.delimiter,
+            quotechar=descriptor.quotechar,
+            decimal=descriptor.decimal,
+            thousands=descriptor.thousands,
+            engine="c",
+            dtype=schema.read_csv_dtypes(),
+        )
+    except pd.errors.ParserError as e:
+        logger.warning(f"El dialecto detectado no aplica a todo el archivo ({e}); usando detección de pandas")
+        df = _read_csv_quarantined(
+            source,
+            descriptor,
+            quarantine,
+            encoding=descriptor.encoding,
+            sep=None,
+            engine="python",
+            dtype=schema.read_csv_dtypes(),
+        )
+    return schema.apply(df)
+
+
+def _read_csv_quarantined(
+    source,
+    descriptor: FormatDescriptor,
+    quarantine: Optional[List[BadLine]],
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """
+    ``read_csv_bytes`` que salta las líneas mal formadas y las pone en cuarentena
+
+    El parser sigue en C (``on_bad_lines="warn"``); un último registro
+    cortado (comilla sin cerrar, o sin salto final y con montos que no
+    parsean) no se entrega al parser.
+    """
+    buffer = _as_binary_buffer(source)
+    truncated = _truncated_last_line(buffer, descriptor)
+    skipped: List[Tuple[int, str]] = []
+    with capture_bad_lines(skipped):
+        df = read_csv_bytes(without_truncated_line(buffer, truncated), on_bad_lines="warn", **read_csv_kwargs)
+    _extend_quarantine(quarantine, _quarantine_lines(buffer, descriptor, skipped, truncated))
+    return df
+
+
+def _truncated_last_line(source, descriptor: FormatDescriptor) -> Optional[Tuple[int, bytes]]:
+    # Los montos se revisan en las posiciones de las columnas del archivo
+    amount_columns = schema_for(descriptor).amount_columns
+    amount_positions = [i for i, col in enumerate(descriptor.columns) if col in amount_columns]
+    return truncated_last_line(
+        _as_binary_buffer(source), descriptor.delimiter, descriptor.quotechar, amount_positions
+    )
+
+
+def _arrow_quarantine_lines(
+    source,
+    descriptor: FormatDescriptor,
+    invalid_rows: list,
+    truncated: Optional[Tuple[int, bytes]] = None,
+) -> List[BadLine]:
+    """
+    Cuarentena de las filas rechazadas por pyarrow (ubicadas por su texto)
+    """
+    buffer = _as_binary_buffer(source)
+    if not invalid_rows:
+        return _quarantine_lines(buffer, descriptor, [], truncated)
+    located = locate_lines(buffer, descriptor.header_offset, [text for text, _ in invalid_rows], descriptor.encoding)
+    bad_lines = [
+        BadLine(
+            line_number=descriptor.header_row + number if number is not None else None,
+            text=text,
+            reason=reason,
+        )
+        for (text, reason), number in zip(invalid_rows, located)
+    ]
+    name = getattr(source, 'name', 'archivo')
+    for bad_line in bad_lines:
+        logger.warning(f"{name}: línea {bad_line.line_number or '?'} en cuarentena ({bad_line.reason})")
+    return bad_lines + _quarantine_lines(buffer, descriptor, [], truncated)
+
+
+def _tag_account(df: pd.DataFrame, descriptor: FormatDescriptor) -> pd.DataFrame:
+    """
+    Etiquetar las filas con la cuenta de la metadata (columna ``Cuenta``)
+
+    Todas las rutas de lectura etiquetan igual, así las filas de estados de
+    cuenta concatenados siguen separables por cuenta después de unirlas.
+    Los CSV genéricos (sin formato registrado ni metadata) no se etiquetan.
+    """
+    if descriptor.is_registered and "Cuenta" not in df.columns:
+        df["Cuenta"] = descriptor.metadata.account if descriptor.metadata is not None else None
+    return df
+
+
+def _closing(chunks: Iterator[pd.DataFrame], handle) -> Iterator[pd.DataFrame]:
+    """Entregar los bloques y cerrar ``handle`` al terminar"""
+    try:
+        yield from chunks
+    finally:
+        handle.close()
+
+
+def _extend_quarantine(quarantine: Optional[List[BadLine]], bad_lines: List[BadLine]) -> None:
+    if quarantine is not None:
+        quarantine.extend(bad_lines)
 
 
 class BankReader:
     """Lector principal para archivos bancarios"""
     
-    def __init__(self):
-        """Inicializar el lector"""
-        pass
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        backend: str = "pandas",
+        max_file_size_mb: int = 200,
+        tail_state_dir: Optional[str] = None,
+        workers: int = 4,
+    ):
+        """
+        Inicializar el lector
+
+        Args:
+            chunk_size: Filas por bloque en el modo streaming
+            backend: "pandas" o "pyarrow" (se degrada a pandas sin pyarrow)
+            max_file_size_mb: Tamaño máximo descomprimido por miembro de .zip
+            tail_state_dir: Directorio del estado por cuenta del modo
+                seguimiento; None lo desactiva
+            workers: Secciones/miembros que ``read_file`` lee en paralelo
+        """
+        self.chunk_size = chunk_size
+        self.backend = resolve_backend(backend)
+        self.max_file_size_mb = max_file_size_mb
+        self.tail_store = TailStateStore(tail_state_dir) if tail_state_dir else None
+        self.workers = max(1, workers)
     
-    def read_file(self, uploaded_file) -> pd.DataFrame:
+    @contextmanager
+    def open_members(self, uploaded_file) -> Iterator[list]:
+        """
+        Obtener los estados de cuenta a procesar de un archivo subido
+
+        Los .zip y .gz se expanden en sus miembros (descompresión en
+        streaming, sin disco); las rutas en disco se mapean con ``mmap``; los
+        archivos con varias cuentas concatenadas se separan en una sección
+        por cuenta y cualquier otro archivo se devuelve tal cual. Todo lo que
+        se abre aquí (mapeo, miembros y secciones) se cierra al salir del
+        bloque ``with``; el uploaded_file recibido no se cierra.
+
+        Args:
+            uploaded_file: Archivo subido desde Streamlit o ruta (``os.PathLike``)
+
+        Yields:
+            Lista de archivos con interfaz de buffer binario y atributo ``name``
+        """
+        source = open_source(uploaded_file)
+        opened = [source] if source is not uploaded_file else []
+        try:
+            if is_archive(source):
+                archive_members = open_archive_members(source, self.max_file_size_mb)
+                opened.extend(archive_members)
+            else:
+                archive_members = [source]
+            members = []
+            for member in archive_members:
+                sections = self._split_statements(member)
+                if len(sections) != 1 or sections[0] is not member:
+                    opened.extend(sections)
+                members.extend(sections)
+            yield members
+        finally:
+            # Secciones antes que miembros y el mapeo al final (sus vistas lo retienen)
+            for handle in reversed(opened):
+                handle.close()
+
+    def _split_statements(self, uploaded_file) -> list:
+        """
+        Separar un archivo con varios estados de cuenta en sus secciones
+
+        Solo aplica a formatos con metadata antes del encabezado (BanBajío):
+        un recorrido por bloques ubica cada repetición del encabezado.
+        """
+        descriptor = detect_format(uploaded_file)
+        if not descriptor.is_registered or descriptor.header_row == 0:
+            return [uploaded_file]
+
+        sections = find_statement_sections(uploaded_file, descriptor.header_offset, descriptor.header_row)
+        if len(sections) == 1:
+            return [uploaded_file]
+
+        name = getattr(uploaded_file, "name", "archivo")
+        logger.info(f"{name}: {len(sections)} estados de cuenta concatenados")
+        if hasattr(uploaded_file, "getbuffer"):
+            view = uploaded_file.getbuffer()
+            return [
+                StatementSection(f"{name}#{idx}", view[start:end])
+                for idx, (start, end) in enumerate(sections, 1)
+            ]
+
+        # Miembros comprimidos: cada sección se lee una vez a memoria
+        result = []
+        for idx, (start, end) in enumerate(sections, 1):
+            uploaded_file.seek(start)
+            result.append(StatementSection(f"{name}#{idx}", uploaded_file.read(end - start)))
+        uploaded_file.seek(0)
+        return result
+    
+    def read_file(
+        self,
+        uploaded_file,
+        schema: Optional[ReadSchema] = None,
+        quarantine: Optional[List[BadLine]] = None,
+    ) -> pd.DataFrame:
         """
         Leer archivo bancario desde Streamlit uploaded_file
         
         Args:
-            uploaded_file: Archivo subido desde Streamlit
+            uploaded_file: Archivo subido desde Streamlit o ruta (``os.PathLike``)
+                (TXT, CSV, .zip o .gz)
+            schema: Tipos de columna (dtypes, montos en centavos y
+                convertidores); por defecto el esquema del formato detectado
+            quarantine: Lista donde se agregan las líneas mal formadas (BadLine)
             
         Returns:
-            DataFrame con datos leídos
+            DataFrame con datos leídos y tipados
+        """
+        with self.open_members(uploaded_file) as members:
+            if len(members) == 1:
+                return self._read_tagged(members[0], schema, quarantine)
+            if not members:
+                return pd.DataFrame()
+
+            # Varios miembros o cuentas: cada uno se parsea en paralelo y se etiqueta
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(members))) as executor:
+                frames = list(executor.map(lambda member: self._read_tagged(member, schema, quarantine), members))
+        return pd.concat(frames, ignore_index=True)
+
+    def _read_tagged(self, member, schema: Optional[ReadSchema] = None, quarantine: Optional[List[BadLine]] = None) -> pd.DataFrame:
+        """
+        Leer un miembro/sección y etiquetar sus filas con la cuenta de su metadata
+        """
+        descriptor = detect_format(member)
+        df = read_smart_csv(member, backend=self.backend, schema=schema, quarantine=quarantine)
+        return _tag_account(df, descriptor)
+    
+    def detect_format(self, uploaded_file) -> FormatDescriptor:
+        """
+        Detectar el formato del archivo a partir de una muestra
+
+        Args:
+            uploaded_file: Archivo subido desde Streamlit o ruta (``os.PathLike``)
+
+        Returns:
+            FormatDescriptor del archivo
+        """
+        if is_path(uploaded_file):
+            with MappedFile(uploaded_file) as mapped:
+                return detect_format(mapped)
+        return detect_format(uploaded_file)
+    
+    def read_file_chunks(
+        self,
+        uploaded_file,
+        schema: Optional[ReadSchema] = None,
+        quarantine: Optional[List[BadLine]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Leer archivo bancario por bloques con memoria acotada
+
+        Los archivos de bancos registrados (BanBajío, BBVA, Santander,
+        Banorte) se leen en streaming directamente del buffer; cualquier otro
+        formato se entrega como un único bloque. Los .zip y
+        .gz se descomprimen en streaming y sus miembros se leen en orden.
+
+        Args:
+            uploaded_file: Archivo subido desde Streamlit o ruta (``os.PathLike``)
+            schema: Tipos de columna; por defecto el esquema del formato
+            quarantine: Lista donde se agregan las líneas mal formadas (BadLine)
+            
+        Yields:
+            DataFrames con los datos leídos, bloque por bloque
+        """
+        with self.open_members(uploaded_file) as members:
+            for member in members:
+                yield from self._read_member_chunks(member, schema, quarantine)
+
+    def _read_member_chunks(
+        self,
+        uploaded_file,
+        schema: Optional[ReadSchema] = None,
+        quarantine: Optional[List[BadLine]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Leer por bloques un único estado de cuenta (no comprimido), con sus
+        filas etiquetadas con la cuenta de su metadata
+        """
+        descriptor = detect_format(uploaded_file)
+        for chunk in self._iter_member_chunks(uploaded_file, descriptor, schema, quarantine):
+            yield _tag_account(chunk, descriptor)
+
+    def _iter_member_chunks(
+        self,
+        uploaded_file,
+        descriptor: FormatDescriptor,
+        schema: Optional[ReadSchema] = None,
+        quarantine: Optional[List[BadLine]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Bloques de un estado de cuenta con el backend configurado (sin etiquetar)
+        """
+        if schema is None:
+            schema = schema_for(descriptor)
+        if not descriptor.is_registered:
+            yield read_smart_csv(uploaded_file, backend=self.backend, schema=schema, quarantine=quarantine)
+            return
+
+        if self.backend == "pyarrow":
+            yielded = False
+            try:
+                invalid_rows: List[Tuple[str, str]] = []
+                truncated = _truncated_last_line(uploaded_file, descriptor)
+                stream, encoding = _utf8_stream_at_header(uploaded_file, descriptor, truncated)
+                for chunk in iter_banbajio_arrow_batches(
+                    stream,
+                    stream.tell(),
+                    encoding=encoding,
+                    delimiter=descriptor.delimiter,
+                    schema=schema,
+                    invalid_rows=invalid_rows,
+                ):
+                    yielded = True
+                    yield chunk
+                _extend_quarantine(
+                    quarantine, _arrow_quarantine_lines(uploaded_file, descriptor, invalid_rows, truncated)
+                )
+                uploaded_file.seek(0)
+                return
+            except ValueError as e:
+                # Solo se puede degradar si aún no se entregó ningún bloque
+                if yielded:
+                    raise
+                logger.warning(f"pyarrow no pudo leer el archivo ({e}); usando pandas")
+
+        yield from iter_banbajio_chunks(uploaded_file, self.chunk_size, descriptor, schema, quarantine=quarantine)
+        uploaded_file.seek(0)
+
+    def read_new_chunks(
+        self,
+        uploaded_file,
+        schema: Optional[ReadSchema] = None,
+        quarantine: Optional[List[BadLine]] = None,
+    ) -> Tuple[Iterator[pd.DataFrame], Optional[TailCheckpoint]]:
+        """
+        Leer solo las filas agregadas desde la última ingesta de la cuenta
+
+        Si la exportación es continuación de la anterior (la última fila
+        ingerida sigue en su lugar) se leen únicamente los bytes posteriores;
+        en otro caso se lee el archivo completo. Sin ``tail_state_dir`` o
+        para formatos sin plugin equivale a ``read_file_chunks``.
+
+        Args:
+            uploaded_file: Estado de cuenta (no comprimido) o ruta (``os.PathLike``)
+            schema: Tipos de columna; por defecto el esquema del formato
+            quarantine: Lista donde se agregan las líneas mal formadas (BadLine)
+
+        Returns:
+            Tupla (bloques, checkpoint a guardar con ``commit_tail`` una vez
+            ingeridos los datos; None si no aplica)
+        """
+        if is_path(uploaded_file):
+            # El mapeo se cierra cuando se terminan (o se cierran) los bloques
+            mapped = MappedFile(uploaded_file)
+            try:
+                chunks, checkpoint = self.read_new_chunks(mapped, schema, quarantine)
+            except BaseException:
+                mapped.close()
+                raise
+            return _closing(chunks, mapped), checkpoint
+
+        descriptor = detect_format(uploaded_file)
+        if self.tail_store is None or not descriptor.is_registered:
+            return self._read_member_chunks(uploaded_file, schema, quarantine), None
+
+        account = account_key(uploaded_file, descriptor)
+        previous = self.tail_store.load(account)
+        start = self.tail_store.resume_offset(uploaded_file, descriptor, previous)
+        checkpoint = self.tail_store.checkpoint(uploaded_file, descriptor, account)
+
+        if start is None:
+            if previous is not None:
+                logger.info(f"{account}: la exportación no continúa la anterior; lectura completa")
+            return self._read_member_chunks(uploaded_file, schema, quarantine), checkpoint
+
+        if checkpoint is None or start >= descriptor.header_offset + checkpoint.offset:
+            logger.info(f"{account}: sin filas nuevas desde la última ingesta")
+            uploaded_file.seek(0)
+            return iter(()), None
+
+        logger.info(f"{account}: leyendo solo las filas agregadas (desde el byte {start})")
+        return self._read_tail_chunks(uploaded_file, descriptor, schema, start, quarantine), checkpoint
+
+    def _read_tail_chunks(self, uploaded_file, descriptor, schema, start: int, quarantine=None) -> Iterator[pd.DataFrame]:
+        """
+        Leer por bloques las filas a partir de ``start``
+        """
+        for chunk in iter_banbajio_chunks(
+            uploaded_file, self.chunk_size, descriptor, schema, start_offset=start, quarantine=quarantine
+        ):
+            yield _tag_account(chunk, descriptor)
+        uploaded_file.seek(0)
+
+    def limit_tail(
+        self,
+        uploaded_file,
+        checkpoint: Optional[TailCheckpoint],
+        quarantine: List[BadLine],
+    ) -> Optional[TailCheckpoint]:
+        """
+        Retroceder el checkpoint antes de la primera línea en cuarentena
+
+        Una fila en cuarentena no se ingirió: si el checkpoint la dejara
+        atrás, la siguiente exportación (ya corregida) no la volvería a leer.
+        Las filas válidas posteriores se releen y el dedupe las descarta.
+
+        Args:
+            uploaded_file: Estado de cuenta leído con ``read_new_chunks``
+            checkpoint: Checkpoint devuelto por ``read_new_chunks``
+            quarantine: Líneas en cuarentena de esa lectura (ya consumidos los bloques)
+
+        Returns:
+            Checkpoint a guardar (None si no quedan filas antes de la cuarentena
+            o si alguna línea en cuarentena no se pudo ubicar)
+        """
+        if checkpoint is None or not quarantine or self.tail_store is None:
+            return checkpoint
+        if is_path(uploaded_file):
+            with closing(MappedFile(uploaded_file)) as mapped:
+                return self.limit_tail(mapped, checkpoint, quarantine)
+
+        numbers = [bad_line.line_number for bad_line in quarantine]
+        if None in numbers:
+            # Sin ubicación no se sabe hasta dónde se ingirió: se conserva el checkpoint anterior
+            logger.info(f"{checkpoint.account}: línea en cuarentena sin ubicar; el checkpoint no avanza")
+            return None
+        end = line_offset(uploaded_file, min(n for n in numbers if n is not None))
+        uploaded_file.seek(0)
+        if end is None:
+            return checkpoint
+        descriptor = detect_format(uploaded_file)
+        limited = self.tail_store.checkpoint(uploaded_file, descriptor, checkpoint.account, end=end)
+        logger.info(
+            f"{checkpoint.account}: checkpoint antes de la línea en cuarentena (byte {end})"
+        )
+        return limited
+
+    def commit_tail(self, checkpoint: Optional[TailCheckpoint]) -> None:
+        """
+        Guardar la posición ingerida de una cuenta (modo seguimiento)
+
+        Args:
+            checkpoint: Checkpoint devuelto por ``read_new_chunks``
         """
-        return read_smart_csv(uploaded_file)
\ No newline at end of file
+        if checkpoint is not None and self.tail_store is not None:
+            self.tail_store.save(checkpoint)
+            logger.info(f"{checkpoint.account}: ingerido hasta el byte {checkpoint.offset} de los datos")
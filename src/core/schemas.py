@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Esquemas de lectura - Tipos finales de las columnas por formato bancario
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from .parser import amounts_to_cents
+
+
+@dataclass(frozen=True)
+class ReadSchema:
+    """
+    Tipos de columna que se aplican al momento de leer el archivo
+
+    ``dtypes`` se entrega a ``pd.read_csv`` (texto, ``category``...), las
+    ``amount_columns`` se convierten a centavos int64 y ``converters`` son
+    conversiones vectorizadas (Series -> Series) por columna. El DataFrame
+    resultante ya trae sus tipos finales y las etapas posteriores no vuelven a convertir.
+    ``rename`` lleva las columnas de cada banco a los nombres de BanBajío que
+    entiende el parser (se aplica al final, así que los tipos usan los
+    nombres originales del archivo).
+    """
+
+    dtypes: Dict[str, Any] = field(default_factory=dict)
+    amount_columns: Tuple[str, ...] = ()
+    converters: Dict[str, Callable[[pd.Series], pd.Series]] = field(default_factory=dict)
+    rename: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def category_columns(self) -> Tuple[str, ...]:
+        return tuple(c for c, dtype in self.dtypes.items() if dtype == "category")
+
+    def read_csv_dtypes(self) -> Dict[str, Any]:
+        """Tipos para ``pd.read_csv``; los montos se leen como texto"""
+        dtypes = dict(self.dtypes)
+        dtypes.update({c: str for c in self.amount_columns})
+        return dtypes
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplicar montos en centavos y convertidores a un DataFrame ya leído
+
+        Marca ``df.attrs["amount_unit"] = "cents"`` para que el parser sepa
+        que los montos ya vienen convertidos; las filas con algún monto no
+        convertible quedan marcadas en la columna ``MontoInvalido``.
+        """
+        invalid_amounts = pd.Series(False, index=df.index)
+        for col in self.amount_columns:
+            if col in df.columns and not pd.api.types.is_integer_dtype(df[col]):
+                df[col], invalid = amounts_to_cents(df[col])
+                invalid_amounts |= invalid
+        if any(col in df.columns for col in self.amount_columns):
+            df["MontoInvalido"] = invalid_amounts
+        for col, convert in self.converters.items():
+            if col in df.columns:
+                df[col] = convert(df[col])
+        if self.rename:
+            df = df.rename(columns=self.rename)
+        if self.amount_columns:
+            df.attrs["amount_unit"] = "cents"
+        return df
+
+
+# Estado de cuenta BanBajío: #,Fecha Movimiento,Hora,Recibo,Descripción,Cargos,Abonos,Saldo
+BANBAJIO_SCHEMA = ReadSchema(
+    dtypes={
+        "#": str,
+        "Fecha Movimiento": "category",
+        "Hora": "category",
+        "Recibo": str,
+        "Descripción": str,
+    },
+    amount_columns=("Cargos", "Abonos", "Saldo"),
+)
+
+
+# BBVA: Fecha de Operación,Fecha Valor,Concepto,Referencia,Cargo,Abono,Saldo
+BBVA_SCHEMA = ReadSchema(
+    dtypes={
+        "Fecha de Operación": "category",
+        "Fecha Valor": "category",
+        "Concepto": str,
+        "Referencia": str,
+    },
+    amount_columns=("Cargo", "Abono", "Saldo"),
+    rename={
+        "Fecha de Operación": "Fecha Movimiento",
+        "Concepto": "Descripción",
+        "Referencia": "Recibo",
+        "Cargo": "Cargos",
+        "Abono": "Abonos",
+    },
+)
+
+
+# Santander: Cuenta,Fecha,Hora,Sucursal,Descripción,Cargos,Abonos,Saldo,Referencia
+SANTANDER_SCHEMA = ReadSchema(
+    dtypes={
+        "Cuenta": str,
+        "Fecha": "category",
+        "Hora": "category",
+        "Sucursal": str,
+        "Descripción": str,
+        "Referencia": str,
+    },
+    amount_columns=("Cargos", "Abonos", "Saldo"),
+    rename={
+        "Fecha": "Fecha Movimiento",
+        "Referencia": "Recibo",
+    },
+)
+
+
+# Banorte: Cuenta,Fecha De Operación,Fecha,Referencia,Descripción,Cod. Transac,
+# Sucursal,Depósitos,Retiros,Saldo,Movimiento,Descripción Detallada,Cheque
+BANORTE_SCHEMA = ReadSchema(
+    dtypes={
+        "Cuenta": str,
+        "Fecha De Operación": "category",
+        "Fecha": "category",
+        "Referencia": str,
+        "Descripción": str,
+        "Cod. Transac": str,
+        "Sucursal": str,
+        "Movimiento": str,
+        "Descripción Detallada": str,
+        "Cheque": str,
+    },
+    amount_columns=("Depósitos", "Retiros", "Saldo"),
+    rename={
+        "Fecha De Operación": "Fecha Movimiento",
+        "Fecha": "Fecha Valor",
+        "Referencia": "Recibo",
+        "Depósitos": "Abonos",
+        "Retiros": "Cargos",
+        "Descripción Detallada": "Leyenda",
+        # "Movimiento" es la fecha y hora combinadas que calcula el parser
+        "Movimiento": "MovimientoBanorte",
+    },
+)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Archivos con varios estados de cuenta concatenados
+
+Algunas exportaciones juntan varias cuentas en un mismo archivo; cada
+sección repite su línea de metadata y su encabezado. Las secciones se
+ubican con un solo recorrido por bloques buscando la línea de encabezados,
+sin decodificar ni parsear el contenido.
+"""
+
+import io
+from typing import List, Tuple
+
+# Bytes por bloque al buscar encabezados
+SECTION_SCAN_BLOCK_SIZE = 1024 * 1024
+
+# Bytes previos que se conservan entre bloques para ubicar la metadata
+SECTION_CONTEXT_SIZE = 64 * 1024
+
+
+def find_statement_sections(
+    buffer,
+    header_offset: int,
+    header_row: int,
+    block_size: int = SECTION_SCAN_BLOCK_SIZE,
+) -> List[Tuple[int, int]]:
+    """
+    Ubicar las secciones (estado de cuenta por cuenta) de un archivo
+
+    Busca las repeticiones de la primera línea de encabezados; cada sección
+    empieza ``header_row`` líneas antes de su encabezado (la metadata).
+
+    Args:
+        buffer: Buffer binario con posibilidad de ``seek``
+        header_offset: Byte donde inicia el primer encabezado
+        header_row: Líneas de metadata antes de cada encabezado
+        block_size: Bytes por bloque del recorrido
+
+    Returns:
+        Lista de rangos (inicio, fin) en bytes; un solo rango si el archivo
+        tiene una sola cuenta
+    """
+    buffer.seek(header_offset)
+    header = buffer.readline().rstrip(b"\r\n")
+    size = buffer.seek(0, io.SEEK_END)
+    if not header:
+        buffer.seek(0)
+        return [(0, size)]
+
+    pattern = b"\n" + header
+    keep = max(len(pattern) - 1, SECTION_CONTEXT_SIZE)
+    starts = [0]
+    pos = header_offset + len(header)
+    carry = b""
+
+    buffer.seek(pos)
+    while True:
+        block = buffer.read(block_size)
+        if not block:
+            break
+        window = carry + block
+        window_start = pos - len(carry)
+
+        # Las coincidencias completamente dentro de ``carry`` ya se contaron
+        idx = window.find(pattern, max(0, len(carry) - len(pattern) + 1))
+        while idx != -1:
+            end_of_header = idx + len(pattern)
+            if end_of_header >= len(window) or window[end_of_header:end_of_header + 1] in (b"\r", b"\n"):
+                section_start = idx + 1
+                for _ in range(header_row):
+                    section_start = window.rfind(b"\n", 0, max(section_start - 1, 0)) + 1
+                starts.append(window_start + section_start)
+            idx = window.find(pattern, idx + 1)
+
+        pos += len(block)
+        carry = window[-keep:]
+
+    buffer.seek(0)
+    return list(zip(starts, starts[1:] + [size]))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Lectura incremental de exportaciones que crecen (modo seguimiento)
+
+Tesorería vuelve a exportar la misma cuenta varias veces al día y cada
+exportación contiene a la anterior. Por cuenta se guarda el byte hasta el
+que ya se ingirió y el hash de la última fila; si la nueva exportación
+conserva esa fila en el mismo lugar solo se leen las líneas agregadas.
+"""
+
+import io
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_KEY_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+# Caracteres de una fila sin datos
+_BLANK_ROW_CHARS = b' \t\r,;|"'
+
+
+@dataclass(frozen=True)
+class TailCheckpoint:
+    """
+    Posición ingerida de una cuenta
+
+    Los offsets son relativos al inicio de la línea de encabezados: la
+    metadata (saldo final, periodo) cambia de largo entre exportaciones.
+    """
+
+    account: str
+    offset: int                 # Byte siguiente a la última fila ingerida
+    row_start: int              # Byte donde inicia la última fila ingerida
+    row_hash: str               # MD5 de los bytes de la última fila
+    updated_at: str = ""
+
+
+def _row_hash(raw: bytes) -> str:
+    return hashlib.md5(raw.rstrip(b"\r\n")).hexdigest()
+
+
+def account_key(buffer, descriptor) -> str:
+    """
+    Identificador de la cuenta de un estado de cuenta
+
+    Usa la cuenta (o CLABE) de la metadata detectada; si el archivo no
+    trae metadata, el nombre del archivo.
+    """
+    metadata = descriptor.metadata
+    if metadata is not None and (metadata.account or metadata.clabe):
+        return f"{descriptor.bank}-{metadata.account or metadata.clabe}"
+    name = os.path.basename(getattr(buffer, "name", "") or "archivo")
+    return f"{descriptor.bank}-{name}"
+
+
+def _last_row(buffer, data_start: int, end: int, block_size: int = 64 * 1024):
+    """
+    Ubicar la última fila con datos entre ``data_start`` y ``end``
+
+    Lee hacia atrás por bloques, sin recorrer el archivo completo. Las filas
+    vacías o solo con delimitadores (``,,,,``) no cuentan como filas.
+
+    Returns:
+        Tupla (inicio, bytes de la fila) o None si no hay filas
+    """
+    tail = b""
+    pos = end
+    while pos > data_start:
+        step = min(block_size, pos - data_start)
+        pos -= step
+        buffer.seek(pos)
+        tail = buffer.read(step) + tail
+
+        # La primera línea del bloque puede estar incompleta
+        first = 0 if pos == data_start else tail.find(b"\n") + 1
+        if first == 0 and pos != data_start:
+            continue
+
+        lines = tail[first:].split(b"\n")
+        starts = []
+        start = pos + first
+        for line in lines:
+            starts.append(start)
+            start += len(line) + 1
+        for line_start, line in zip(reversed(starts), reversed(lines)):
+            if line.strip(_BLANK_ROW_CHARS):
+                return line_start, line
+        # Todo vacío: seguir buscando antes de lo ya revisado
+        tail = tail[:first]
+    return None
+
+
+def _line_end(buffer, offset: int) -> int:
+    """Byte siguiente al fin de la línea que empieza en ``offset``"""
+    buffer.seek(offset)
+    buffer.readline()
+    return buffer.tell()
+
+
+class TailStateStore:
+    """Estado de seguimiento por cuenta, guardado como JSON en un directorio"""
+
+    def __init__(self, state_dir: str):
+        self.state_dir = state_dir
+        self._lock = threading.Lock()
+
+    def _path(self, account: str) -> str:
+        return os.path.join(self.state_dir, f"{_UNSAFE_KEY_CHARS.sub('_', account)}.json")
+
+    def load(self, account: str) -> Optional[TailCheckpoint]:
+        """Último checkpoint de la cuenta (None si nunca se ingirió)"""
+        try:
+            with open(self._path(account), "r", encoding="utf-8") as f:
+                return TailCheckpoint(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Estado de seguimiento inválido para {account}: {e}")
+            return None
+
+    def save(self, checkpoint: TailCheckpoint) -> None:
+        """Guardar el checkpoint de forma atómica"""
+        with self._lock:
+            os.makedirs(self.state_dir, exist_ok=True)
+            path = self._path(checkpoint.account)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(asdict(checkpoint), f)
+            os.replace(tmp_path, path)
+
+    def resume_offset(self, buffer, descriptor, checkpoint: Optional[TailCheckpoint]) -> Optional[int]:
+        """
+        Byte (absoluto) desde el que hay filas nuevas, o None si hay que leer todo
+
+        La exportación se considera continuación de la anterior solo si la
+        última fila ingerida sigue en la misma posición con el mismo hash.
+        """
+        if checkpoint is None:
+            return None
+        size = buffer.seek(0, io.SEEK_END)
+        row_start = descriptor.header_offset + checkpoint.row_start
+        offset = descriptor.header_offset + checkpoint.offset
+        if offset > size:
+            return None
+        buffer.seek(row_start)
+        row = buffer.read(offset - row_start)
+        if _row_hash(row) != checkpoint.row_hash:
+            return None
+        return offset
+
+    def checkpoint(self, buffer, descriptor, account: str, end: Optional[int] = None) -> Optional[TailCheckpoint]:
+        """
+        Checkpoint en la última fila antes de ``end`` (por defecto, el final del archivo)
+
+        Args:
+            end: Byte (absoluto) hasta el que se considera ingerido; las filas
+                desde ahí se vuelven a leer en la siguiente exportación
+
+        Returns:
+            TailCheckpoint o None si no hay filas antes de ``end``
+        """
+        size = buffer.seek(0, io.SEEK_END)
+        data_start = _line_end(buffer, descriptor.header_offset)
+        last = _last_row(buffer, data_start, size if end is None else min(end, size))
+        if last is None:
+            return None
+        row_start, row = last
+        offset = _line_end(buffer, row_start)
+        buffer.seek(0)
+        return TailCheckpoint(
+            account=account,
+            offset=offset - descriptor.header_offset,
+            row_start=row_start - descriptor.header_offset,
+            row_hash=_row_hash(row),
+            updated_at=datetime.now().isoformat(timespec="seconds"),
+        )
@@ -9,11 +9,14 @@ import logging
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
+import numpy as np
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 from google.auth.exceptions import GoogleAuthError
 
+from core.parser import uid_hashes
+
 logger = logging.getLogger(__name__)
 
 class GoogleSheetsService:
@@ -107,6 +110,7 @@ class GoogleSheetsService:
                 logger.info("No hay datos existentes en la hoja")
                 return {
                     "existing_uids": set(),
+                    "existing_uid_hashes": np.empty(0, dtype=np.uint64),
                     "uid_amount_map": {},
                     "total_records": 0,
                     "analysis_ready": True
@@ -137,6 +141,7 @@ class GoogleSheetsService:
             
             return {
                 "existing_uids": existing_uids,
+                "existing_uid_hashes": np.unique(uid_hashes(existing_uids)),  # Ordenados para búsqueda
                 "uid_amount_map": uid_amount_map,
                 "total_records": len(all_data),
                 "analysis_ready": True
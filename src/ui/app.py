@@ -200,10 +200,10 @@ class ConciliadorApp:
 
         # Zona de drag & drop integrada directamente
         uploaded_files = st.file_uploader(
-            "📁 **Arrastra tus archivos aquí o haz clic para seleccionar**\n\nSoporta archivos TXT y CSV de BanBajío",
+            "📁 **Arrastra tus archivos aquí o haz clic para seleccionar**\n\nSoporta archivos TXT y CSV de BanBajío, sueltos o en .zip / .gz",
             accept_multiple_files=True,
-            type=['txt', 'csv'],
-            help="Puedes cargar múltiples archivos a la vez (máx 200MB por archivo)"
+            type=['txt', 'csv', 'zip', 'gz'],
+            help="Puedes cargar múltiples archivos a la vez o un .zip con todos los estados del mes (máx 200MB por archivo)"
         )
 
         if uploaded_files:
@@ -365,6 +365,11 @@ class ConciliadorApp:
             num_duplicados = len(result.get('duplicates', []))
 
             st.markdown(f"### 📄 {result['file_name']}")
+            if result.get('encoding'):
+                st.caption(f"Codificación detectada: {result['encoding']}")
+            metadata = result.get('metadata')
+            if metadata is not None and (metadata.account or metadata.period):
+                st.caption(f"Cuenta: {metadata.account or 'N/D'} · Periodo: {metadata.period or 'N/D'}")
 
             col1, col2 = st.columns(2)
             with col1:
@@ -397,6 +402,50 @@ class ConciliadorApp:
                     if num_duplicados > 20:
                         st.info(f"Mostrando 20 de {num_duplicados} duplicados. Los demás también serán omitidos.")
 
+            # Mostrar filas con montos no convertibles (se insertan en 0)
+            invalid_amounts = result.get('invalid_amounts')
+            if invalid_amounts is not None and not invalid_amounts.empty:
+                with st.expander(f"⚠️ Ver {len(invalid_amounts)} filas con montos inválidos (se insertarán en $0)", expanded=False):
+                    st.warning("El Cargo, Abono o Saldo de estas filas no es un número válido")
+                    st.dataframe(
+                        invalid_amounts[[c for c in ["Fecha", "Hora", "Recibo", "Descripción"] if c in invalid_amounts.columns]],
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
+            # Mostrar filas donde el saldo corrido no cuadra (fila faltante o duplicada)
+            balance_check = result.get('balance_check') or {}
+            if balance_check.get('gap_count'):
+                with st.expander(f"📉 Ver {balance_check['gap_count']} saltos en el saldo corrido", expanded=False):
+                    st.warning(
+                        f"El saldo no es el anterior + Abono - Cargo (orden {balance_check['order']}): "
+                        "puede faltar o sobrar un movimiento antes de estas filas"
+                    )
+                    gaps = pd.DataFrame(balance_check['gaps'])
+                    st.dataframe(
+                        pd.DataFrame({
+                            'Fila': gaps['position'] + 1,
+                            'Saldo esperado': gaps['expected_cents'] / 100,
+                            'Saldo en archivo': gaps['actual_cents'] / 100,
+                            'Diferencia': gaps['difference_cents'] / 100,
+                        }),
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
+            # Mostrar líneas mal formadas (no se leyeron)
+            quarantine = result.get('quarantine', [])
+            if quarantine:
+                with st.expander(f"🚧 Ver {len(quarantine)} líneas en cuarentena (NO se leyeron)", expanded=False):
+                    st.warning("Corrige estas líneas en el archivo y vuelve a cargarlo")
+                    st.dataframe(
+                        pd.DataFrame(quarantine).rename(columns={
+                            'line_number': 'Línea', 'text': 'Contenido', 'reason': 'Motivo'
+                        }),
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
             # Mostrar vista previa de datos nuevos (ahora ordenados si se aplicó)
             if not result["new_data"].empty:
                 preview_title = "✅ Vista previa de datos NUEVOS que se insertarán"
@@ -620,6 +669,10 @@ class ConciliadorApp:
                     # Ejecutar inserción
                     insertion_result = self.sheets_service.insert_results(results, sidebar_config["sheet_tab"])
 
+                    # Modo seguimiento: la próxima exportación solo aportará filas nuevas
+                    if insertion_result.get("errors", 0) == 0:
+                        self.processor.commit_tail(results)
+
                     # COMPLETADO
                     progress_bar.progress(100)
                     status_text.success("✅ Inserción completada exitosamente")
@@ -10,8 +10,11 @@ import hashlib
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Set, Tuple
+import numpy as np
 import pandas as pd
 
+from core.parser import uid_hashes
+
 logger = logging.getLogger(__name__)
 
 def setup_logging(log_level: str = "INFO", log_file: str = "logs/app.log"):
@@ -44,10 +47,20 @@ def setup_logging(log_level: str = "INFO", log_file: str = "logs/app.log"):
     root_logger.addHandler(file_handler)
     root_logger.addHandler(console_handler)
 
+def _amount_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype="float64")
+
+
 def analyze_duplicates_exhaustive(df: pd.DataFrame, existing_analysis: Dict[str, Any]) -> Dict[str, Any]:
     """
     Análisis exhaustivo de duplicados con mejoras de rendimiento
 
+    La búsqueda de UIDs existentes se hace sobre los hashes de 64 bits
+    (``UIDHash``) con numpy; solo las filas cuyo hash coincide se comparan
+    contra el UID en texto para descartar colisiones.
+
     Args:
         df: DataFrame con datos a analizar
         existing_analysis: Análisis de datos existentes
@@ -59,28 +72,51 @@ def analyze_duplicates_exhaustive(df: pd.DataFrame, existing_analysis: Dict[str,
     
     existing_uids = existing_analysis.get("existing_uids", set())
     uid_amount_map = existing_analysis.get("uid_amount_map", {})
+    existing_hashes = existing_analysis.get("existing_uid_hashes")
+    if existing_hashes is None:
+        existing_hashes = np.unique(uid_hashes(existing_uids))
     
     safe_to_insert = []
     duplicates = []
     conflicts = []
-    
-    for idx, row in df.iterrows():
-        uid = row.get('UID')
-        if not uid:
-            continue
+
+    if 'UID' in df.columns and len(df):
+        uids = df['UID'].to_numpy(dtype=object)
+        # Filas sin UID no se analizan
+        has_uid = (uids != None) & (uids != "")  # noqa: E711 - comparación elemento a elemento
+        if 'UIDHash' in df.columns:
+            hashes = df['UIDHash'].to_numpy(dtype=np.uint64)
+        else:
+            hashes = uid_hashes(pd.Series(uids).where(has_uid, ""))
 
         # Calcular monto neto
-        cargo = float(row.get('Cargo', 0) or 0)
-        abono = float(row.get('Abono', 0) or 0)
-        monto_neto = abono - cargo
-        
-        if uid in existing_uids:
+        montos = _amount_column(df, 'Abono') - _amount_column(df, 'Cargo')
+
+        candidates = has_uid & np.isin(hashes, existing_hashes)
+        exists = np.zeros(len(df), dtype=bool)
+        for pos in np.flatnonzero(candidates).tolist():
+            if uids[pos] in existing_uids:
+                exists[pos] = True
+            else:
+                logger.warning(f"Colisión de hash para UID {uids[pos]}; se trata como nuevo")
+
+        for pos, (idx, uid, monto_neto) in enumerate(zip(df.index, uids, montos)):
+            if not has_uid[pos]:
+                continue
+            if not exists[pos]:
+                safe_to_insert.append({
+                    "row_index": idx,
+                    "uid": uid,
+                    "amount": monto_neto
+                })
+                continue
+
             # Verificar si es conflicto (mismo UID, monto diferente)
             existing_amount = uid_amount_map.get(uid, 0)
             if abs(existing_amount - monto_neto) > 0.01:  # Tolerancia de 1 centavo
                 conflicts.append({
                     "row_index": idx,
-                        "uid": uid,
+                    "uid": uid,
                     "existing_amount": existing_amount,
                     "new_amount": monto_neto,
                     "difference": monto_neto - existing_amount
@@ -92,12 +128,6 @@ def analyze_duplicates_exhaustive(df: pd.DataFrame, existing_analysis: Dict[str,
                     "uid": uid,
                     "amount": monto_neto
                 })
-        else:
-            safe_to_insert.append({
-                "row_index": idx,
-                "uid": uid,
-                "amount": monto_neto
-            })
     
     summary = {
         "safe_to_insert": len(safe_to_insert),
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Configuración común de los tests
+
+Los módulos de ``src`` se importan como en la app (``from core...``), así que
+``src`` se agrega al path. Los tests corren en modo demo: nunca se conectan a
+Google Sheets.
+"""
+
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DEMO_MODE", "true")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+METADATA_LINE = (
+    "BANCO DEL BAJIO SA,Cuenta 0123456789,CLABE 030180900012345678,"
+    "Periodo 01-Jul-2025 al 31-Jul-2025,Saldo inicial 1000.00,Saldo final 2000.00"
+)
+HEADER_LINE = "#,Fecha Movimiento,Hora,Recibo,Descripción,Cargos,Abonos,Saldo"
+
+DESCRIPTIONS = [
+    "SPEI Recibido de CLIENTE clave de rastreo: ABC123456789XY",
+    "SPEI Enviado transf a PROV clave de rastreo MBAN01002507210012",
+    "Comisión por servicio",
+    "IVA comision",
+    "Deposito en efectivo",
+]
+
+
+class Upload(io.BytesIO):
+    """Archivo subido (como el UploadedFile de Streamlit): bytes con nombre"""
+
+    def __init__(self, content: bytes, name: str = "estado.txt"):
+        super().__init__(content)
+        self.name = name
+
+
+def statement_rows(n: int, start_balance: float = 100000.0, first: int = 1):
+    """Filas BanBajío deterministas con saldo corrido consistente"""
+    saldo = start_balance
+    rows = []
+    for i in range(n):
+        cargo = round(100 + i * 1.25, 2) if i % 2 else 0
+        abono = 0 if cargo else round(250 + i * 0.5, 2)
+        saldo = round(saldo - cargo + abono, 2)
+        rows.append(
+            f"{first + i},{i % 28 + 1:02d}-Jul-2025,{i % 24:02d}:{i % 60:02d}:10,{9000000000000 + first + i},"
+            f'"{DESCRIPTIONS[i % len(DESCRIPTIONS)]}",{cargo},{abono},{saldo}'
+        )
+    return rows
+
+
+def statement_text(n: int = 10, rows=None) -> str:
+    """Estado de cuenta BanBajío completo (metadata, encabezado y filas)"""
+    body = statement_rows(n) if rows is None else rows
+    return "\n".join([METADATA_LINE, HEADER_LINE, *body]) + "\n"
+
+
+@pytest.fixture
+def make_upload():
+    """Fábrica de archivos subidos con un estado de cuenta de ``n`` filas"""
+
+    def _make(n: int = 10, name: str = "estado.txt", rows=None, encoding: str = "utf-8") -> Upload:
+        return Upload(statement_text(n, rows).encode(encoding), name)
+
+    return _make
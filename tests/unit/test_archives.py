@@ -0,0 +1,86 @@
+"""Tests de lectura de estados de cuenta .zip/.gz (core.archives)"""
+
+import gzip
+import io
+import os
+import zipfile
+
+import pytest
+
+from conftest import Upload, statement_text
+from core import archives
+from core.archives import is_archive, open_archive_members
+from core.reader import BankReader
+
+
+def _zip(files) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_detects_archives_by_magic_bytes():
+    assert is_archive(Upload(gzip.compress(b"x"), "sin_extension"))
+    assert is_archive(Upload(_zip({"a.txt": "x"}), "otro.txt"))
+    assert not is_archive(Upload(statement_text(3).encode(), "estado.gz"))
+
+
+def test_gzip_member_reads_like_the_original():
+    text = statement_text(20)
+    members = open_archive_members(Upload(gzip.compress(text.encode()), "julio.txt.gz"))
+
+    assert [m.name for m in members] == ["julio.txt"]
+    member = members[0]
+    assert member.readline().decode() == text.splitlines(True)[0]
+    member.seek(0)
+    assert member.read().decode() == text
+
+
+def test_zip_lists_supported_members_only():
+    content = _zip(
+        {
+            "julio.txt": statement_text(5),
+            "agosto.csv": statement_text(7),
+            "notas.pdf": "no es estado",
+            "__MACOSX/._julio.txt": "basura",
+        }
+    )
+    members = open_archive_members(Upload(content, "lote.zip"))
+
+    assert sorted(m.name for m in members) == ["lote.zip/agosto.csv", "lote.zip/julio.txt"]
+
+
+def test_member_is_decompressed_once(monkeypatch):
+    calls = []
+    original = archives._decompress
+
+    def counting(stream, max_bytes, name):
+        calls.append(name)
+        return original(stream, max_bytes, name)
+
+    monkeypatch.setattr(archives, "_decompress", counting)
+    upload = Upload(gzip.compress(statement_text(50).encode()), "a.txt.gz")
+
+    # Detección de formato, metadata, secciones y bloques sobre el mismo buffer
+    chunks = list(BankReader(chunk_size=7).read_file_chunks(upload))
+
+    assert sum(len(chunk) for chunk in chunks) == 50
+    assert len(chunks) > 1
+    assert calls == ["a.txt"]
+
+
+def test_gzip_member_over_the_cap_is_rejected():
+    bomb = gzip.compress(b"0" * (2 * 1024 * 1024 + 1))
+    member = open_archive_members(Upload(bomb, "bomba.txt.gz"), max_member_size_mb=2)[0]
+
+    with pytest.raises(ValueError, match="excede 2 MB"):
+        member.read(10)
+
+
+def test_zip_member_over_the_cap_is_skipped():
+    content = _zip({"grande.txt": "0" * (1024 * 1024 + 1), "chico.txt": statement_text(3)})
+    members = open_archive_members(Upload(content, "lote.zip"), max_member_size_mb=1)
+
+    assert [os.path.basename(m.name) for m in members] == ["chico.txt"]
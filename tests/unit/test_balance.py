@@ -0,0 +1,53 @@
+"""Tests de la continuidad del saldo (core.balance) con varias cuentas"""
+
+from conftest import Upload, statement_rows, statement_text
+from core.balance import ASCENDING, DESCENDING, check_balance_continuity
+from core.parser import parse_and_enrich
+from core.reader import BankReader
+
+SECOND_ACCOUNT = "5555555555"
+
+
+def _parse(*statements: str):
+    df_raw = BankReader().read_file(Upload("".join(statements).encode()))
+    df, _ = parse_and_enrich(df_raw)
+    return df
+
+
+def _second_statement(rows):
+    return statement_text(rows=rows).replace("0123456789", SECOND_ACCOUNT)
+
+
+def test_account_change_is_not_a_gap():
+    df = _parse(statement_text(rows=statement_rows(6)), _second_statement(statement_rows(5, start_balance=500.0)))
+
+    check = check_balance_continuity(df)
+
+    assert df["Cuenta"].tolist() == ["0123456789"] * 6 + [SECOND_ACCOUNT] * 5
+    assert check.ok and check.order == ASCENDING
+    assert check.checked == 9  # 5 + 4 pares; el cambio de cuenta no se compara
+
+
+def test_missing_row_is_reported_in_its_account():
+    second = statement_rows(6, start_balance=500.0)
+    del second[3]
+    df = _parse(statement_text(rows=statement_rows(6)), _second_statement(second))
+
+    check = check_balance_continuity(df)
+
+    assert check.gap_count == 1
+    gap = check.gaps[0]
+    assert gap.position == 6 + 3 and df["Cuenta"].iloc[gap.position] == SECOND_ACCOUNT
+    assert gap.expected_cents == round(df["Saldo"].iloc[gap.position - 1] * 100) + round(
+        (df["Abono"].iloc[gap.position] - df["Cargo"].iloc[gap.position]) * 100
+    )
+
+
+def test_descending_statements_per_account():
+    first = statement_rows(6)[::-1]
+    second = statement_rows(5, start_balance=500.0)[::-1]
+    df = _parse(statement_text(rows=first), _second_statement(second))
+
+    check = check_balance_continuity(df)
+
+    assert check.ok and check.order == DESCENDING and check.checked == 9
@@ -0,0 +1,32 @@
+"""Tests de la lectura por bloques (BankReader.read_file_chunks y el processor)"""
+
+import pandas as pd
+
+from core.processor import BankProcessor
+from core.reader import BankReader
+
+
+def test_chunks_match_a_single_read(make_upload):
+    whole = BankReader(chunk_size=1000).read_file(make_upload(40))
+    chunks = list(BankReader(chunk_size=6).read_file_chunks(make_upload(40)))
+
+    assert [len(chunk) for chunk in chunks] == [6] * 6 + [4]
+    # Cada bloque tiene sus propias categorías: se comparan los valores
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True).astype(object),
+        whole.reset_index(drop=True).astype(object),
+    )
+
+
+def _formatted(upload, chunk_size: int) -> pd.DataFrame:
+    processor = BankProcessor()
+    processor.reader.chunk_size = chunk_size
+    return processor.process_files([upload], None, None, True)[0]["new_data"]
+
+
+def test_formatting_by_chunks_matches_whole_file(make_upload):
+    whole = _formatted(make_upload(40), 1000)
+    by_chunks = _formatted(make_upload(40), 6)
+
+    assert list(by_chunks["Prueba"]) == list(range(370, 410))
+    pd.testing.assert_frame_equal(by_chunks.astype(str), whole.astype(str))
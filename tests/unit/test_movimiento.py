@@ -0,0 +1,45 @@
+"""Tests de la columna datetime64 Movimiento que calcula el parser"""
+
+import pandas as pd
+
+from conftest import Upload, statement_text
+from core.parser import movement_datetimes, parse_and_enrich
+from core.processor import BankProcessor
+from core.reader import BankReader
+
+
+def test_parser_adds_movimiento():
+    df, _ = parse_and_enrich(BankReader().read_file(Upload(statement_text(3).encode())))
+
+    assert df["Movimiento"].dtype == "datetime64[ns]"
+    assert df["Movimiento"].tolist() == [
+        pd.Timestamp("2025-07-01 00:00:10"),
+        pd.Timestamp("2025-07-02 01:01:10"),
+        pd.Timestamp("2025-07-03 02:02:10"),
+    ]
+
+
+def test_movement_datetimes_hours():
+    fechas = pd.Series(["01/07/2025", "2025-07-02", "03-Jul-2025", "04-Jul-2025", ""])
+    horas = pd.Series(["9:05", "", "25:00", "23:59:59", "10:00"])
+
+    movimiento = movement_datetimes(fechas, horas)
+
+    assert movimiento.iloc[0] == pd.Timestamp("2025-07-01 09:05:00")
+    assert movimiento.iloc[1] == pd.Timestamp("2025-07-02")  # sin hora: medianoche
+    assert pd.isna(movimiento.iloc[2])  # hora inválida
+    assert movimiento.iloc[3] == pd.Timestamp("2025-07-04 23:59:59")
+    assert pd.isna(movimiento.iloc[4])  # sin fecha
+
+
+def test_sort_uses_movimiento():
+    df = pd.DataFrame({
+        "Fecha": ["2025-07-01", "2025-07-01", "2025-06-30"],
+        "Hora": ["08:00:00", "17:30:00", "23:00:00"],
+        "Recibo": ["a", "b", "c"],
+    })
+    df["Movimiento"] = movement_datetimes(df["Fecha"], df["Hora"])
+
+    newest_first = BankProcessor().sort_data_by_datetime(df)
+
+    assert newest_first["Recibo"].tolist() == ["b", "a", "c"]
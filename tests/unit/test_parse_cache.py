@@ -0,0 +1,73 @@
+"""Tests del cache de parseo por contenido (core.parse_cache)"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import Upload, statement_rows, statement_text
+from core import parse_cache
+from core.parse_cache import ParseCache
+from core.processor import BankProcessor
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = BankProcessor()
+    processor.parse_cache = ParseCache(str(tmp_path))
+    return processor
+
+
+def _statement_without_recibo() -> bytes:
+    rows = statement_rows(12)
+    fields = rows[4].split(",")
+    fields[3] = ""  # Recibo vacío: NaN en la tabla parseada
+    rows[4] = ",".join(fields)
+    return statement_text(rows=rows).encode()
+
+
+def _process(processor: BankProcessor, content: bytes):
+    return processor.process_files([Upload(content)], None, None, demo_mode=True)[0]
+
+
+def test_hit_returns_same_tables(processor, tmp_path):
+    content = _statement_without_recibo()
+
+    fresh = _process(processor, content)
+    cached = _process(processor, content)
+
+    assert not fresh["from_cache"] and cached["from_cache"]
+    assert len(os.listdir(tmp_path)) == 1
+    pd.testing.assert_frame_equal(fresh["raw_data"], cached["raw_data"])
+    pd.testing.assert_frame_equal(fresh["new_data"], cached["new_data"])
+    assert pd.isna(cached["raw_data"]["Recibo"].iloc[4])
+    assert cached["metadata"] == fresh["metadata"]
+
+
+def test_other_content_is_a_miss(processor):
+    _process(processor, statement_text(10).encode())
+
+    assert not _process(processor, statement_text(11).encode())["from_cache"]
+
+
+def test_parser_version_invalidates(processor, monkeypatch):
+    content = statement_text(10).encode()
+    _process(processor, content)
+
+    monkeypatch.setattr(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + "-next")
+
+    assert not _process(processor, content)["from_cache"]
+    assert _process(processor, content)["from_cache"]
+
+
+def test_backend_is_part_of_the_key(tmp_path):
+    processor = BankProcessor()
+    processor.parse_cache = ParseCache(str(tmp_path), backend="pandas")
+    _process(processor, statement_text(10).encode())
+
+    processor.parse_cache = ParseCache(str(tmp_path), backend="pyarrow")
+
+    assert not _process(processor, statement_text(10).encode())["from_cache"]
+    assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,64 @@
+"""Tests de la cuarentena de líneas mal formadas (core.quarantine y BankReader)"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from conftest import Upload, statement_rows, statement_text
+from core.quarantine import locate_lines
+from core.reader import BankReader
+
+# Metadata en la línea 1 y encabezado en la 2: la fila i (0-based) está en la línea i + 3
+FIRST_ROW_LINE = 3
+
+BACKENDS = ["pandas", "pyarrow"]
+
+
+def _read(content: bytes, backend: str, chunk_size: int):
+    quarantine = []
+    reader = BankReader(chunk_size=chunk_size, backend=backend)
+    df = pd.concat(list(reader.read_file_chunks(Upload(content), quarantine=quarantine)), ignore_index=True)
+    return df, quarantine
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("chunk_size", [4, 1000])
+def test_extra_fields_report_their_line(backend, chunk_size):
+    rows = statement_rows(12)
+    rows[2] += ",sobra"
+    rows[9] += ",sobra"
+
+    df, quarantine = _read(statement_text(rows=rows).encode(), backend, chunk_size)
+
+    assert len(df) == 10
+    assert [bad.line_number for bad in quarantine] == [2 + FIRST_ROW_LINE, 9 + FIRST_ROW_LINE]
+    assert [bad.text for bad in quarantine] == [rows[2], rows[9]]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_repeated_bad_rows_get_each_line_number(backend):
+    rows = statement_rows(8)
+    rows[1] = rows[5] = "1,01-Jul-2025,00:00:10,1,x,0,1,2,sobra"
+
+    _, quarantine = _read(statement_text(rows=rows).encode(), backend, 1000)
+
+    assert [bad.line_number for bad in quarantine] == [1 + FIRST_ROW_LINE, 5 + FIRST_ROW_LINE]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_truncated_last_record_is_quarantined(backend):
+    rows = statement_rows(6)
+    rows[-1] = rows[-1][: rows[-1].index('",') + 3]  # Cortado a mitad de los montos
+    content = statement_text(rows=rows).rstrip("\n").encode()
+
+    df, quarantine = _read(content, backend, 4)
+
+    assert len(df) == 5
+    assert [bad.line_number for bad in quarantine] == [5 + FIRST_ROW_LINE]
+
+
+def test_locate_lines_returns_none_for_unknown_text():
+    buffer = io.BytesIO(b"a,1\nb,2\na,1\n")
+
+    assert locate_lines(buffer, 0, ["a,1", "zz", "a,1"], "utf-8") == [1, None, 3]
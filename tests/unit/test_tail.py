@@ -0,0 +1,77 @@
+"""Tests del modo seguimiento (checkpoints por cuenta en core.tail)"""
+
+import pandas as pd
+
+from conftest import METADATA_LINE, Upload, statement_rows, statement_text
+from core.reader import BankReader
+from core.tail import TailStateStore
+
+
+def _read_new(reader: BankReader, upload):
+    quarantine = []
+    chunks, checkpoint = reader.read_new_chunks(upload, quarantine=quarantine)
+    chunks = list(chunks)
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return df, reader.limit_tail(upload, checkpoint, quarantine)
+
+
+def test_checkpoint_is_saved_and_read_back(tmp_path, make_upload):
+    reader = BankReader(tail_state_dir=str(tmp_path))
+    _, checkpoint = _read_new(reader, make_upload(10))
+    reader.commit_tail(checkpoint)
+
+    assert TailStateStore(str(tmp_path)).load(checkpoint.account) == checkpoint
+
+
+def test_only_appended_rows_are_read(tmp_path):
+    rows = statement_rows(15)
+    reader = BankReader(chunk_size=4, tail_state_dir=str(tmp_path))
+
+    first, checkpoint = _read_new(reader, Upload(statement_text(rows=rows[:10]).encode()))
+    reader.commit_tail(checkpoint)
+    second, checkpoint = _read_new(reader, Upload(statement_text(rows=rows).encode()))
+    reader.commit_tail(checkpoint)
+    third, checkpoint = _read_new(reader, Upload(statement_text(rows=rows).encode()))
+
+    assert len(first) == 10
+    assert list(second["Recibo"]) == [row.split(",")[3] for row in rows[10:]]
+    assert third.empty and checkpoint is None
+
+
+def test_changed_metadata_line_still_resumes(tmp_path):
+    rows = statement_rows(12)
+    reader = BankReader(tail_state_dir=str(tmp_path))
+    _, checkpoint = _read_new(reader, Upload(statement_text(rows=rows[:8]).encode()))
+    reader.commit_tail(checkpoint)
+
+    # El saldo final del encabezado cambia de largo entre exportaciones
+    longer = statement_text(rows=rows).replace(METADATA_LINE, METADATA_LINE.replace("2000.00", "12999.99"))
+    df, _ = _read_new(reader, Upload(longer.encode()))
+
+    assert len(df) == 4
+
+
+def test_export_that_does_not_continue_is_read_in_full(tmp_path):
+    reader = BankReader(tail_state_dir=str(tmp_path))
+    _, checkpoint = _read_new(reader, Upload(statement_text(rows=statement_rows(10)).encode()))
+    reader.commit_tail(checkpoint)
+
+    other = statement_rows(6, start_balance=5000.0, first=100)
+    df, _ = _read_new(reader, Upload(statement_text(rows=other).encode()))
+
+    assert len(df) == 6
+
+
+def test_checkpoint_stops_before_quarantined_line(tmp_path):
+    rows = statement_rows(10)
+    rows[6] += ",extra,extra"  # Campos de más: va a cuarentena
+    reader = BankReader(tail_state_dir=str(tmp_path))
+    first, checkpoint = _read_new(reader, Upload(statement_text(rows=rows).encode()))
+    reader.commit_tail(checkpoint)
+
+    fixed = statement_rows(10)
+    second, _ = _read_new(reader, Upload(statement_text(rows=fixed).encode()))
+
+    assert len(first) == 9
+    # Se relee desde la fila corregida (las posteriores las descarta el dedupe)
+    assert list(second["Recibo"]) == [row.split(",")[3] for row in fixed[6:]]